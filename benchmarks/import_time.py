@@ -0,0 +1,82 @@
+"""
+Import-time budget check for ezfetch
+
+Runs ``python -X importtime`` on the CLI entry module several times, takes
+the fastest run and fails if importing ezfetch exceeds the budget or pulls
+in modules that must only be loaded by the collectors that need them.
+
+Usage:
+    python benchmarks/import_time.py [--budget-ms 30] [--runs 5] [--top 10]
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Module importing the CLI must not load these
+FORBIDDEN = ["psutil", "subprocess", "ctypes", "socketserver", "ezfetch.info"]
+
+DEFAULT_BUDGET_MS = 30.0
+
+
+def measure(module: str = "ezfetch.__main__") -> Dict[str, Tuple[int, int]]:
+    """
+    Import module in a fresh interpreter and parse -X importtime output
+
+    Returns:
+        Mapping of module name to (self_us, cumulative_us)
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(ROOT),
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check ezfetch's import-time budget")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Maximum cumulative import time of ezfetch (default: {DEFAULT_BUDGET_MS})")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs; the fastest is used")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest modules to list")
+    args = parser.parse_args(argv)
+
+    best = None
+    for _ in range(max(1, args.runs)):
+        timings = measure()
+        if best is None or timings["ezfetch.__main__"][1] < best["ezfetch.__main__"][1]:
+            best = timings
+
+    total_ms = best["ezfetch.__main__"][1] / 1000
+    print(f"ezfetch.__main__: {total_ms:.1f} ms (budget {args.budget_ms:.1f} ms)")
+    print("Slowest modules (self time):")
+    for name, (self_us, _) in sorted(best.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {self_us / 1000:7.2f} ms  {name}")
+
+    failed = False
+    loaded = [name for name in FORBIDDEN if name in best]
+    if loaded:
+        print(f"FAIL: eagerly imported {', '.join(loaded)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("FAIL: import-time budget exceeded")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,22 @@
 __version__ = "1.1.0"
 __author__ = "yokaimsi, himonshuuu"
 
-__all__ = ["main", "display_info", "__version__"]
+__all__ = [
+    "main", "display_info", "collect", "SystemInfo", "Usage", "Disk", "Cpu",
+    "Gpu", "Battery", "Packages", "__version__",
+]
 
-from .__main__ import main, display_info
+# Names served lazily from ezfetch.api
+_API = ("collect", "SystemInfo", "Usage", "Disk", "Cpu", "Gpu", "Battery", "Packages")
+
+
+def __getattr__(name):
+    # Loaded on first use so "import ezfetch" stays cheap and
+    # "python -m ezfetch" doesn't import __main__ twice
+    if name in ("main", "display_info"):
+        from . import __main__
+        return getattr(__main__, name)
+    if name in _API:
+        from . import api
+        return getattr(api, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,17 +1,20 @@
 """
 Main entry point for ezfetch
 """
+import time
+
+# Origin of --deadline-ms, taken before the other imports so they count
+# against the deadline too
+START = time.monotonic()
+
 import argparse
-import json
 import sys
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Mapping, Optional
 
 from . import __version__
 from .logo import get_logo, list_logos
-from .info import *
-from .colors import Colors, Theme, colorize
+from .colors import Theme
 from .config import get_config
-from .utils import truncate
 
 
 def parse_args() -> argparse.Namespace:
@@ -32,7 +35,7 @@ def parse_args() -> argparse.Namespace:
         "-l", "--logo",
         type=str,
         metavar="NAME",
-        help=f"Logo to display (available: {', '.join(list_logos()[:5])}...)"
+        help="Logo to display (see --list-logos)"
     )
     
     parser.add_argument(
@@ -86,6 +89,76 @@ def parse_args() -> argparse.Namespace:
         help="Disable colors in output"
     )
     
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't read or write cached values"
+    )
+    
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached values and store freshly collected ones"
+    )
+    
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run in the foreground as a daemon serving snapshots over a Unix socket"
+    )
+    
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Collect in-process even if a daemon is running"
+    )
+    
+    parser.add_argument(
+        "-w", "--watch",
+        nargs="?",
+        type=float,
+        const=0,
+        metavar="SECONDS",
+        help="Keep the display on screen and refresh changing fields in place "
+             "(every SECONDS, default: per-field intervals)"
+    )
+    
+    parser.add_argument(
+        "--stream",
+        nargs="?",
+        const="full",
+        choices=["full", "changes"],
+        help="With --json, keep running and write one compact JSON line per "
+             "refresh: the full snapshot (default) or only the changed fields"
+    )
+    
+    parser.add_argument(
+        "--deadline-ms",
+        type=int,
+        metavar="N",
+        help="Render after N milliseconds with whatever fields finished; "
+             "others show their last cached value or a placeholder"
+    )
+    
+    # Internal: run by the detached background refresher
+    parser.add_argument(
+        "--revalidate",
+        metavar="FIELDS",
+        help=argparse.SUPPRESS
+    )
+    
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time every collector and render stage and print a table to stderr"
+    )
+    
+    parser.add_argument(
+        "--profile-out",
+        metavar="FILE",
+        help="Write the profile as Chrome trace-event JSON to FILE"
+    )
+    
     parser.add_argument(
         "-f", "--field",
         action="append",
@@ -93,32 +166,21 @@ def parse_args() -> argparse.Namespace:
         help="Show specific field(s) only (can be used multiple times)"
     )
     
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.stream and not args.json:
+        parser.error("--stream requires --json")
+    return args
 
 
 def get_system_info() -> Dict[str, Any]:
-    """Collect all system information"""
-    return {
-        "User": get_user_host(),
-        "Host": get_host(),
-        "OS": get_os(),
-        "Kernel": get_kernel(),
-        "Uptime": get_uptime(),
-        "Packages": get_packages(),
-        "Shell": get_shell(),
-        "Resolution": get_resolution(),
-        "DE": get_desktop_env(),
-        "WM": get_window_manager(),
-        "Terminal": get_terminal(),
-        "CPU": get_cpu(),
-        "GPU": get_gpu(),
-        "Memory": get_memory(),
-        "Swap": get_swap(),
-        "Disk": get_disk(),
-        "Local IP": get_ip(),
-        "Battery": get_battery(),
-        "Locale": get_locale(),
-    }
+    """Collect all system information, in configured field order"""
+    from .collector import COLLECTORS, Snapshot
+    
+    config = get_config()
+    enabled = config.get("fields", "enabled") or []
+    order = [label for label in enabled if label in COLLECTORS]
+    order += [label for label in COLLECTORS if label not in order]
+    return Snapshot.from_config(config, order).resolve()
 
 
 def filter_fields(
@@ -135,6 +197,15 @@ def filter_fields(
         if enabled_fields and label not in enabled_fields:
             continue
         
+        # Fields with several values (e.g. one per mount) get a line each
+        if isinstance(value, dict):
+            filtered.update(filter_fields(
+                {f"{label} ({name})": item for name, item in value.items()},
+                hide_unavailable=hide_unavailable,
+                hide_unknown=hide_unknown,
+            ))
+            continue
+        
         # Skip unavailable fields
         if hide_unavailable and value in ["Unavailable", "N/A"]:
             continue
@@ -151,6 +222,7 @@ def filter_fields(
 
 def display_json(info: Dict[str, str]) -> None:
     """Display system info as JSON"""
+    import json
     print(json.dumps(info, indent=2))
 
 
@@ -163,6 +235,8 @@ def display_info(
     fields_filter: Optional[list] = None,
     truncate_length: int = 50,
     logo_padding: int = 30,
+    snapshot: Optional[Mapping[str, Any]] = None,
+    watch: Optional[float] = None,
 ) -> None:
     """
     Display system information with ASCII logo
@@ -174,70 +248,99 @@ def display_info(
         theme_name: Name of color theme
         use_colors: Whether to use colors
         fields_filter: List of field names to display
-        truncate_length: Maximum length for field values
+        truncate_length: Maximum length for field values when the terminal
+            width is unknown
         logo_padding: Padding between logo and fields
+        snapshot: Already collected system info, e.g. a Snapshot or values
+            fetched from the daemon (collected here if omitted)
+        watch: Keep refreshing in place; volatile fields are refreshed every
+            this many seconds, or on their own intervals if 0
     """
     # Get configuration
     config = get_config()
+    hide_unavailable = config.get("fields", "hide_unavailable", default=True)
+    hide_unknown = config.get("fields", "hide_unknown", default=False)
     
     # Initialize theme
-    theme = Theme(theme_name) if use_colors else Theme("default")
-    
-    # Get system info
-    info = get_system_info()
+    theme = Theme(theme_name) if use_colors else None
     
     # Filter fields
     enabled_fields = fields_filter or config.get("fields", "enabled")
-    hide_unavailable = config.get("fields", "hide_unavailable", default=True)
-    hide_unknown = config.get("fields", "hide_unknown", default=False)
     
-    filtered_info = filter_fields(
-        info,
-        enabled_fields=enabled_fields,
-        hide_unavailable=hide_unavailable,
-        hide_unknown=hide_unknown
-    )
+    # Get system info, collecting only the fields that will be shown
+    if snapshot is None or (watch is not None and not hasattr(snapshot, "refresh")):
+        from .collector import Snapshot
+        snapshot = Snapshot.from_config(config, enabled_fields)
     
-    # Truncate long values
-    for label in filtered_info:
-        if len(filtered_info[label]) > truncate_length:
-            filtered_info[label] = truncate(filtered_info[label], truncate_length)
+    from .render import Layout, terminal_width
+    from .tracing import active
+    profiler = active()
     
     # Prepare logo
-    logo_lines = []
+    logo_lines = None
     if show_logo:
-        logo = get_logo(logo_name, custom_logo_path)
+        if profiler is not None:
+            with profiler.span("logo", "render"):
+                logo = get_logo(logo_name, custom_logo_path)
+        else:
+            logo = get_logo(logo_name, custom_logo_path)
         logo_lines = logo.splitlines()
     
-    # Prepare field lines
-    max_label = max(len(label) for label in filtered_info.keys()) if filtered_info else 0
-    field_lines = []
-    
-    for label, value in filtered_info.items():
-        if use_colors:
-            label_colored = colorize(label, theme.get("label"))
-            separator = colorize(":", theme.get("separator"))
-            value_colored = colorize(value, theme.get("value"))
-            field_line = f"{label_colored:<{max_label + 10}} {separator} {value_colored}"
-        else:
-            field_line = f"{label:<{max_label}} : {value}"
-        field_lines.append(field_line)
+    layout = Layout(logo_lines, theme, logo_padding, terminal_width(), truncate_length)
     
-    # Display output
-    max_lines = max(len(logo_lines), len(field_lines))
+    def visible(info: Mapping[str, Any]) -> Dict[str, Any]:
+        return filter_fields(
+            info,
+            enabled_fields=enabled_fields,
+            hide_unavailable=hide_unavailable,
+            hide_unknown=hide_unknown
+        )
     
-    for i in range(max_lines):
-        logo_line = logo_lines[i] if i < len(logo_lines) else ""
-        field_line = field_lines[i] if i < len(field_lines) else ""
+    if watch is not None:
+        from .collector import refresh_intervals
+        from .watch import run_watch
         
-        if show_logo:
-            print(f"{logo_line:<{logo_padding}}  {field_line}")
-        else:
-            print(field_line)
+        def render(info: Mapping[str, Any]) -> list:
+            layout.width = terminal_width()
+            return layout.lines(visible(info))
+        
+        intervals = refresh_intervals(
+            config.get("performance", "refresh_intervals", default={}),
+            default=watch or None,
+        )
+        run_watch(snapshot, render, intervals)
+        return
+    
+    # Display output as a single write
+    info = dict(snapshot.items())
+    if profiler is not None:
+        with profiler.span("layout", "render"):
+            frame = layout.render(visible(info))
+        with profiler.span("output", "render"):
+            sys.stdout.write(frame)
+    else:
+        sys.stdout.write(layout.render(visible(info)))
+
+
+def _report_profile(profiler, trace_path: Optional[str], table: bool = True) -> None:
+    """Write the trace file if requested, otherwise print the profile table"""
+    if profiler is None:
+        return
+    if trace_path:
+        profiler.write_trace(trace_path)
+    elif table:
+        print(profiler.format_table(), file=sys.stderr)
 
 
 def main() -> None:
     """Main entry point"""
+    if sys.argv[1:2] == ["bench"]:
+        from .bench import main as bench_main
+        sys.exit(bench_main(sys.argv[2:], render=display_info))
+    if sys.argv[1:2] == ["serve-metrics"]:
+        from .metrics import main as metrics_main
+        sys.exit(metrics_main(sys.argv[2:]))
+    
     args = parse_args()
     
     # Handle special flags
@@ -247,27 +350,81 @@ def main() -> None:
             print(f"  - {logo}")
         sys.exit(0)
     
+    # Load config
+    config = get_config(args.config)
+    Theme.register(config.get("themes", default={}))
+    if args.deadline_ms is not None:
+        config.set("performance", "deadline_ms", value=args.deadline_ms)
+    
+    if args.revalidate:
+        from .revalidate import run
+        sys.exit(run(config, args.revalidate.split(",")))
+    
     if args.list_themes:
         print("Available themes:")
         for theme in Theme.list_themes():
             print(f"  - {theme}")
         sys.exit(0)
     
-    # Load config
-    config = get_config(args.config)
-    
     # Get display settings
     show_logo = not args.no_logo and config.get("display", "show_logo", default=True)
     use_colors = not args.no_color and config.get("display", "show_colors", default=True)
     truncate_length = config.get("display", "truncate_length", default=50)
     logo_padding = config.get("display", "logo_padding", default=30)
     
-    # Get system info
-    info = get_system_info()
+    def _set_cache_mode() -> None:
+        from .cache import set_cache_mode
+        set_cache_mode(
+            enabled=not args.no_cache
+            and config.get("performance", "cache_enabled", default=True),
+            refresh=args.refresh,
+        )
+    
+    if args.daemon:
+        from .daemon import run_daemon
+        _set_cache_mode()
+        run_daemon(config)
+        sys.exit(0)
+    
+    profiler = None
+    if args.profile or args.profile_out:
+        from .tracing import enable
+        profiler = enable()
+    
+    # Ask a running daemon first; without one, build the snapshot once here.
+    # Either way only the requested fields are ever collected.
+    snapshot: Optional[Mapping[str, Any]] = None
+    if not (args.no_daemon or args.no_cache or args.refresh
+            or args.watch is not None or args.stream or profiler is not None):
+        from .daemon import fetch
+        snapshot = fetch(args.field or config.get("fields", "enabled"))
+    if snapshot is None:
+        from .collector import Snapshot
+        _set_cache_mode()
+        # A one-shot run shows expired values at once and leaves their
+        # refresh to a background process
+        one_shot = not (args.refresh or args.no_cache
+                        or args.watch is not None or args.stream)
+        snapshot = Snapshot.from_config(config, args.field, revalidate=one_shot)
+        snapshot.origin = START
     
     # Handle JSON output
+    if args.json and args.stream:
+        from .collector import refresh_intervals
+        from .watch import run_stream
+        intervals = refresh_intervals(
+            config.get("performance", "refresh_intervals", default={}),
+            default=args.watch or None,
+        )
+        run_stream(snapshot, intervals, changes_only=args.stream == "changes")
+        sys.exit(0)
+    
     if args.json:
+        info = dict(snapshot.items())
+        if profiler is not None:
+            info["_meta"] = {"profile": profiler.meta()}
         display_json(info)
+        _report_profile(profiler, args.profile_out, table=False)
         sys.exit(0)
     
     # Display info
@@ -280,7 +437,10 @@ def main() -> None:
         fields_filter=args.field,
         truncate_length=truncate_length,
         logo_padding=logo_padding,
+        snapshot=snapshot,
+        watch=args.watch,
     )
+    _report_profile(profiler, args.profile_out)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+"""
+Asyncio collection API
+
+Example:
+    import asyncio
+    from ezfetch import aio
+
+    info = asyncio.run(aio.collect(["OS", "Packages", "GPU"]))
+"""
+import asyncio
+from typing import Any, Dict, Iterable, Optional
+
+from .collector import DEFAULT_TIMEOUT, DEFAULT_WORKERS, Snapshot, cache_policies
+
+
+async def collect(
+    fields: Optional[Iterable[str]] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    timeouts: Optional[Dict[str, float]] = None,
+    max_workers: int = DEFAULT_WORKERS,
+) -> Dict[str, Any]:
+    """
+    Collect the given fields without blocking the event loop
+
+    Collection runs in the loop's default executor on the same engine as
+    the CLI: cached fields come from their cache policy, the rest run on
+    the bounded worker pool, and a collector that runs out of time
+    reports "Unknown" and has the commands it runs killed.
+
+    Args:
+        fields: Field labels to collect, in output order (default: all)
+        timeout: Default per-collector timeout in seconds
+        timeouts: Per-label timeout overrides in seconds
+        max_workers: Maximum number of concurrently running collectors
+
+    Returns:
+        Mapping of field label to value, in the requested order
+    """
+    snapshot = Snapshot(
+        fields,
+        max_workers=max_workers,
+        timeout=timeout,
+        timeouts=timeouts,
+        policies=cache_policies(),
+    )
+    return await asyncio.get_running_loop().run_in_executor(None, snapshot.resolve)
@@ -0,0 +1,177 @@
+"""
+Typed programmatic API with raw numeric values
+
+Example:
+    import ezfetch
+
+    info = ezfetch.collect()
+    print(info.memory.used, info.uptime, info.cpu.frequency)
+
+Sizes are in bytes, durations in seconds, frequencies in Hz and
+percentages in the range 0-100. Display strings are built from these
+values with utils.format_size and utils.format_uptime.
+"""
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass
+class Usage:
+    """Used and total capacity of memory, swap or a filesystem"""
+
+    __slots__ = ("used", "total", "percent")
+
+    used: int  # bytes
+    total: int  # bytes
+    percent: float
+
+
+@dataclass
+class Disk:
+    """A mounted filesystem; usage is None when it did not respond"""
+
+    __slots__ = ("mountpoint", "fstype", "usage")
+
+    mountpoint: str
+    fstype: Optional[str]
+    usage: Optional[Usage]
+
+
+@dataclass
+class Cpu:
+    """CPU model, logical core count and current frequency"""
+
+    __slots__ = ("model", "cores", "frequency")
+
+    model: str
+    cores: Optional[int]
+    frequency: Optional[float]  # Hz
+
+
+@dataclass
+class Gpu:
+    """GPU name and current frequency, where the driver reports one"""
+
+    __slots__ = ("name", "frequency")
+
+    name: str
+    frequency: Optional[float]  # Hz
+
+
+@dataclass
+class Battery:
+    """Charge level and the status reported by the power supply"""
+
+    __slots__ = ("percent", "status")
+
+    percent: float
+    status: str  # e.g. "Charging", "Discharging", "Full"
+
+
+@dataclass
+class Packages:
+    """Installed package count and the manager that reported it"""
+
+    __slots__ = ("count", "manager")
+
+    count: int
+    manager: str
+
+
+@dataclass
+class SystemInfo:
+    """A snapshot of the system; fields are None when unavailable"""
+
+    __slots__ = (
+        "user", "hostname", "host", "os", "kernel", "uptime", "packages",
+        "cpu", "gpus", "memory", "swap", "disks", "battery",
+    )
+
+    user: Optional[str]
+    hostname: str
+    host: Optional[str]
+    os: str
+    kernel: str
+    uptime: Optional[float]  # seconds
+    packages: Optional[Packages]
+    cpu: Optional[Cpu]
+    gpus: List[Gpu]
+    memory: Optional[Usage]
+    swap: Optional[Usage]
+    disks: List[Disk]
+    battery: Optional[Battery]
+
+
+# Package counts are only recounted this often, like the Packages field
+PACKAGES_TTL = 300
+
+
+def _packages() -> Optional[Packages]:
+    """Count packages, reusing a recent count from the cache store"""
+    from .cache import CachePolicy
+    from .info import package_count
+
+    policy = CachePolicy(CachePolicy.TTL, ttl=PACKAGES_TTL)
+    cached = policy.load("api_packages")
+    if cached is not None:
+        return Packages(*cached)
+    packages = package_count()
+    if packages is not None:
+        policy.store("api_packages", [packages.count, packages.manager])
+    return packages
+
+
+def _host() -> Optional[str]:
+    """Get the machine model, read once per boot"""
+    from .cache import CachePolicy
+    from .info import host_model
+
+    policy = CachePolicy(CachePolicy.BOOT)
+    cached = policy.load("api_host")
+    if cached is not None:
+        return cached
+    host = host_model()
+    if host is not None:
+        policy.store("api_host", host)
+    return host
+
+
+def _safe(func, default=None):
+    """Call func, returning default if it raises"""
+    try:
+        return func()
+    except Exception:
+        return default
+
+
+def collect() -> SystemInfo:
+    """
+    Collect a typed snapshot of the system
+
+    Static values come from the per-boot cache and package counts are
+    reused for PACKAGES_TTL seconds, so the call is cheap enough for
+    frequent polling.
+
+    Returns:
+        SystemInfo with raw numeric values
+    """
+    import platform
+    import socket
+
+    from . import info
+
+    return SystemInfo(
+        user=info.current_user(),
+        hostname=socket.gethostname(),
+        host=_safe(_host),
+        os=info.get_os(),
+        kernel=platform.release(),
+        uptime=_safe(info.uptime_seconds),
+        packages=_safe(_packages),
+        cpu=_safe(info.cpu_info),
+        gpus=_safe(info.gpu_info, []),
+        memory=_safe(info.memory_usage),
+        swap=_safe(info.swap_usage),
+        disks=_safe(info.disk_usages, []),
+        battery=_safe(info.battery_status),
+    )
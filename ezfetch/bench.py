@@ -0,0 +1,292 @@
+"""
+Benchmarks for collectors and the renderer
+
+Usage:
+    ezfetch bench [--runs 5] [--field CPU] [--json] [--output FILE]
+                  [--baseline FILE] [--threshold 25] [--min-delta-ms 2]
+"""
+import argparse
+import io
+import json
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Relative slowdown (percent) tolerated before a result counts as a regression
+DEFAULT_THRESHOLD = 25.0
+
+# Absolute slowdown (ms) below which timing differences are treated as noise
+DEFAULT_MIN_DELTA_MS = 2.0
+
+RENDER_LABEL = "render"
+
+
+def _measure(func: Callable[[], Any]) -> Dict[str, float]:
+    """Run func once and record wall time in ms and processes spawned"""
+    from .utils import exec_stats
+
+    spawned = exec_stats()["spawned"]
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    return {
+        "ms": elapsed * 1000,
+        "spawned": exec_stats()["spawned"] - spawned,
+    }
+
+
+def _peak_memory(func: Callable[[], Any]) -> int:
+    """Get the peak number of bytes allocated while running func"""
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _summarize(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    """Reduce per-run samples to min/median latency and spawn count"""
+    times = [sample["ms"] for sample in samples]
+    return {
+        "min_ms": round(min(times), 3),
+        "median_ms": round(statistics.median(times), 3),
+        "spawned": max(sample["spawned"] for sample in samples),
+    }
+
+
+def bench_collector(label: str, runs: int = 5) -> Dict[str, Any]:
+    """
+    Benchmark one collector
+
+    Cold runs disable every cache, so each run pays for the full probe.
+    One untimed call comes first, so module imports and per-process
+    memos are not charged to whichever field happens to run first.
+    Warm runs go through the field's cache policy the way a normal
+    invocation does after the first one.
+
+    Args:
+        label: Field label from collector.COLLECTORS
+        runs: Number of runs for each mode
+
+    Returns:
+        Dict with "cold", "warm" (min_ms, median_ms, spawned) and
+        "peak_bytes" (peak allocation of one cold run)
+    """
+    from .cache import cache_mode, set_cache_mode
+    from .collector import COLLECTORS, cache_key, cache_policies
+
+    collector = COLLECTORS[label]
+    policy = cache_policies().get(label)
+
+    def warm():
+        value = policy.load(cache_key(label)) if policy else None
+        if value is None:
+            value = collector()
+            if policy:
+                policy.store(cache_key(label), value)
+        return value
+
+    enabled, refresh = cache_mode()
+    try:
+        set_cache_mode(enabled=False)
+        collector()  # pay for imports and memos
+        cold_samples = [_measure(collector) for _ in range(runs)]
+        peak = _peak_memory(collector)
+
+        set_cache_mode(enabled=True)
+        warm()  # prime the cache
+        warm_samples = [_measure(warm) for _ in range(runs)]
+    finally:
+        set_cache_mode(enabled, refresh)
+
+    return {
+        "cold": _summarize(cold_samples),
+        "warm": _summarize(warm_samples),
+        "peak_bytes": peak,
+    }
+
+
+def bench_render(
+    render: Callable[..., None], info: Dict[str, Any], runs: int = 5
+) -> Dict[str, Any]:
+    """
+    Benchmark the renderer on already collected values
+
+    The first call is the cold run (it loads the logo and theme); the
+    following calls are warm.
+    """
+    def call():
+        with redirect_stdout(io.StringIO()):
+            render(snapshot=info)
+
+    cold = _measure(call)
+    warm_samples = [_measure(call) for _ in range(runs)]
+    return {
+        "cold": _summarize([cold]),
+        "warm": _summarize(warm_samples),
+        "peak_bytes": _peak_memory(call),
+    }
+
+
+def run_bench(
+    labels: Optional[List[str]] = None,
+    runs: int = 5,
+    render: Optional[Callable[..., None]] = None,
+) -> Dict[str, Any]:
+    """
+    Benchmark collectors and, if given, the renderer
+
+    Args:
+        labels: Field labels to benchmark (default: all collectors)
+        runs: Number of runs per mode
+        render: display_info-compatible renderer taking a snapshot keyword
+
+    Returns:
+        {"runs": runs, "results": {label: result}}
+    """
+    import tempfile
+    from pathlib import Path
+
+    from . import __version__
+    from .cache import Cache, set_cache
+    from .collector import COLLECTORS
+
+    labels = labels or list(COLLECTORS)
+    results = {}
+    info = {}
+    # Benchmark values must not end up in the user's cache store
+    with tempfile.TemporaryDirectory(prefix="ezfetch-bench-") as cache_dir:
+        previous = set_cache(Cache(cache_dir=Path(cache_dir)))
+        try:
+            for label in labels:
+                results[label] = bench_collector(label, runs)
+                info[label] = COLLECTORS[label]()
+            if render is not None:
+                results[RENDER_LABEL] = bench_render(render, info, runs)
+        finally:
+            set_cache(previous)
+    return {"version": __version__, "runs": runs, "results": results}
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> List[str]:
+    """
+    Compare results against a saved baseline
+
+    A median latency counts as a regression when it is both more than
+    threshold percent and more than min_delta_ms slower than the
+    baseline. Any increase in spawned processes is a regression.
+
+    Returns:
+        Human-readable regression descriptions, empty if there are none
+    """
+    regressions = []
+    base_results = baseline.get("results", {})
+    for label, result in current["results"].items():
+        base = base_results.get(label)
+        if not base:
+            continue
+        for mode in ("cold", "warm"):
+            now, before = result[mode], base.get(mode)
+            if not before:
+                continue
+            delta = now["median_ms"] - before["median_ms"]
+            if delta > min_delta_ms and delta > before["median_ms"] * threshold / 100:
+                regressions.append(
+                    f"{label} ({mode}): {before['median_ms']:.2f} ms -> "
+                    f"{now['median_ms']:.2f} ms"
+                )
+            if now["spawned"] > before["spawned"]:
+                regressions.append(
+                    f"{label} ({mode}): {before['spawned']} -> "
+                    f"{now['spawned']} processes"
+                )
+    return regressions
+
+
+def format_table(report: Dict[str, Any]) -> str:
+    """Format benchmark results as a table sorted by cold latency"""
+    rows = sorted(
+        report["results"].items(), key=lambda item: -item[1]["cold"]["median_ms"]
+    )
+    width = max([len("Field")] + [len(label) for label, _ in rows])
+    lines = [
+        f"{'Field':<{width}}  {'cold ms':>9}  {'warm ms':>9}  {'spawns':>6}  {'peak KiB':>8}"
+    ]
+    for label, result in rows:
+        lines.append(
+            f"{label:<{width}}  {result['cold']['median_ms']:9.2f}  "
+            f"{result['warm']['median_ms']:9.2f}  {result['cold']['spawned']:6d}  "
+            f"{result['peak_bytes'] / 1024:8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None, render: Optional[Callable[..., None]] = None) -> int:
+    """
+    Entry point of ``ezfetch bench``
+
+    Args:
+        argv: Command-line arguments after "bench"
+        render: Renderer to benchmark alongside the collectors
+
+    Returns:
+        Exit status: 1 if a regression against the baseline was found
+    """
+    parser = argparse.ArgumentParser(
+        prog="ezfetch bench",
+        description="Measure collector and renderer latency, spawns and memory",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Runs per mode (default: 5)")
+    parser.add_argument("-f", "--field", action="append",
+                        help="Benchmark only this field (can be used multiple times)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("-o", "--output", help="Save results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against results saved with --output")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Tolerated slowdown in percent (default: {DEFAULT_THRESHOLD:g})")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="Ignore slowdowns smaller than this many ms "
+                             f"(default: {DEFAULT_MIN_DELTA_MS:g})")
+    args = parser.parse_args(argv)
+
+    from .collector import COLLECTORS
+
+    unknown = [label for label in args.field or [] if label not in COLLECTORS]
+    if unknown:
+        parser.error(f"unknown field: {', '.join(unknown)}")
+
+    report = run_bench(args.field, max(1, args.runs), render)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_table(report))
+
+    if not args.baseline:
+        return 0
+    try:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read baseline {args.baseline}: {e}", file=sys.stderr)
+        return 2
+
+    regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
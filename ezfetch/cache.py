@@ -1,64 +1,204 @@
 """
 Caching system for expensive operations
 """
+import atexit
 import json
+import os
+import threading
 import time
+import zlib
 from pathlib import Path
-from typing import Any, Optional, Callable
+from typing import Any, Dict, Optional, Callable, List, Sequence, Tuple
 from functools import wraps
 
 
 class Cache:
-    """Simple file-based cache for system info"""
-
+    """
+    Single-file cache for system info
+    
+    Every key lives in one JSON store that is read once per process and
+    rewritten atomically (temp file + rename) when flushed. Each entry
+    carries a CRC32 checksum of its value; entries that fail it are dropped.
+    When the cache directory cannot be created, the cache stays disabled
+    and nothing is read or written.
+    """
+    
+    FORMAT_VERSION = 1
+    STORE_NAME = "store.json"
+    
     def __init__(self, cache_dir: Optional[Path] = None, duration: int = 300):
         self.cache_dir = cache_dir or (Path.home() / ".cache" / "ezfetch")
         self.duration = duration
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-
-    def get(self, key: str) -> Optional[Any]:
-        """Get cached value if not expired"""
-        cache_file = self.cache_dir / f"{key}.json"
-        if not cache_file.exists():
-            return None
-
         try:
-            with open(cache_file, "r") as f:
-                data = json.load(f)
-            
-            if time.time() - data.get("timestamp", 0) < self.duration:
-                return data.get("value")
-        except (json.JSONDecodeError, IOError):
-            pass
-
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.enabled = True
+        except OSError:
+            self.enabled = False
+        self.store_file = self.cache_dir / self.STORE_NAME
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._flush_registered = False
+    
+    @staticmethod
+    def _checksum(value: Any) -> int:
+        """Checksum of a value's canonical JSON encoding"""
+        encoded = json.dumps(value, sort_keys=True, separators=(",", ":"))
+        return zlib.crc32(encoded.encode("utf-8"))
+    
+    def _read_store(self) -> Dict[str, Dict[str, Any]]:
+        """Read and validate every entry from the store file"""
+        try:
+            with open(self.store_file, "rb") as f:
+                data = json.loads(f.read().decode("utf-8"))
+        except (ValueError, IOError, OSError):
+            return {}
+        
+        if not isinstance(data, dict) or data.get("version") != self.FORMAT_VERSION:
+            return {}
+        
+        entries = {}
+        for key, entry in (data.get("entries") or {}).items():
+            if (
+                isinstance(entry, dict)
+                and entry.get("checksum") == self._checksum(entry.get("value"))
+            ):
+                entries[key] = entry
+        return entries
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Get the in-memory entries, reading the store on first use"""
+        if self._entries is None:
+            self._entries = self._read_store()
+        return self._entries
+    
+    def get(
+        self, key: str, expire: bool = True, max_age: Optional[float] = None
+    ) -> Optional[Any]:
+        """
+        Get cached value if not expired
+        
+        Args:
+            key: Cache key
+            expire: Whether to apply an age limit at all
+            max_age: Age limit in seconds (default: cache duration)
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is None:
+            return None
+        
+        limit = self.duration if max_age is None else max_age
+        if not expire or time.time() - entry.get("timestamp", 0) < limit:
+            return entry.get("value")
         return None
-
+    
     def set(self, key: str, value: Any) -> None:
-        """Cache a value with timestamp"""
-        cache_file = self.cache_dir / f"{key}.json"
-        try:
-            with open(cache_file, "w") as f:
-                json.dump({
-                    "timestamp": time.time(),
-                    "value": value
-                }, f)
-        except IOError:
-            pass
-
+        """Cache a value with timestamp (written out on flush)"""
+        if not self.enabled:
+            return
+        entry = {
+            "timestamp": time.time(),
+            "checksum": self._checksum(value),
+            "value": value,
+        }
+        with self._lock:
+            self._load()[key] = entry
+            self._dirty[key] = entry
+            self._schedule_flush()
+    
     def clear(self, key: Optional[str] = None) -> None:
         """Clear specific key or all cache"""
-        if key:
-            cache_file = self.cache_dir / f"{key}.json"
-            if cache_file.exists():
-                cache_file.unlink()
-        else:
+        with self._lock:
+            entries = self._load()
+            keys = [key] if key else list(entries)
+            for name in keys:
+                entries.pop(name, None)
+                self._dirty[name] = None
+            self._schedule_flush()
+        
+        if not key:
+            # Remove per-key files left by older versions
             for cache_file in self.cache_dir.glob("*.json"):
-                cache_file.unlink()
+                if cache_file != self.store_file:
+                    try:
+                        cache_file.unlink()
+                    except OSError:
+                        pass
+    
+    def _schedule_flush(self) -> None:
+        """Make sure pending changes are written at interpreter exit"""
+        if not self._flush_registered:
+            atexit.register(self.flush)
+            self._flush_registered = True
+    
+    def flush(self) -> None:
+        """
+        Atomically write pending changes to the store
+        
+        The store is re-read first so entries written by other processes
+        since this one loaded it are kept.
+        """
+        with self._lock:
+            if not self.enabled or not self._dirty:
+                return
+            entries = self._read_store()
+            for key, entry in self._dirty.items():
+                if entry is None:
+                    entries.pop(key, None)
+                else:
+                    entries[key] = entry
+            self._dirty.clear()
+            self._entries = entries
+        
+        import tempfile
+        
+        payload = json.dumps(
+            {"version": self.FORMAT_VERSION, "entries": entries},
+            separators=(",", ":"),
+        )
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                dir=str(self.cache_dir), prefix=".store-", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.store_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (IOError, OSError):
+            pass
 
 
 # Global cache instance
 _cache_instance: Optional[Cache] = None
 
+# Run-wide cache mode, set from --no-cache / --refresh
+_cache_enabled = True
+_cache_refresh = False
+
+
+def set_cache_mode(enabled: bool = True, refresh: bool = False) -> None:
+    """
+    Set run-wide cache behaviour
+    
+    Args:
+        enabled: Whether cached values may be read or written at all
+        refresh: Ignore cached values but store freshly computed ones
+    """
+    global _cache_enabled, _cache_refresh
+    _cache_enabled = enabled
+    _cache_refresh = refresh
+
+
+def cache_mode() -> Tuple[bool, bool]:
+    """Get the run-wide (enabled, refresh) cache mode"""
+    return _cache_enabled, _cache_refresh
+
 
 def get_cache(duration: int = 300) -> Cache:
     """Get or create global cache instance"""
@@ -68,13 +208,30 @@ def get_cache(duration: int = 300) -> Cache:
     return _cache_instance
 
 
+def set_cache(cache: Optional[Cache]) -> Optional[Cache]:
+    """
+    Replace the global cache instance
+    
+    Args:
+        cache: Cache to use from now on (None: create the default lazily)
+    
+    Returns:
+        The previous instance, to restore later
+    """
+    global _cache_instance
+    previous, _cache_instance = _cache_instance, cache
+    return previous
+
+
 def cached(key: str, duration: int = 300):
     """Decorator to cache function results"""
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs):
+            if not _cache_enabled:
+                return func(*args, **kwargs)
             cache = get_cache(duration)
-            cached_value = cache.get(key)
+            cached_value = None if _cache_refresh else cache.get(key)
             if cached_value is not None:
                 return cached_value
             
@@ -83,3 +240,147 @@ def wrapper(*args, **kwargs):
             return result
         return wrapper
     return decorator
+
+
+def boot_id() -> Optional[str]:
+    """Get an identifier that changes on every boot, if available"""
+    try:
+        with open("/proc/sys/kernel/random/boot_id", "r") as f:
+            return f.read().strip()
+    except (IOError, OSError):
+        return None
+
+
+def _stat_token(path: str) -> Optional[List[int]]:
+    """Get [inode, mtime_ns, size] of path or None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_ino, st.st_mtime_ns, st.st_size]
+
+
+class CachePolicy:
+    """Rule deciding whether a cached value is still valid"""
+    
+    NEVER = "never"
+    TTL = "ttl"
+    BOOT = "boot"
+    VALIDATOR = "validator"
+    
+    def __init__(
+        self,
+        kind: str = NEVER,
+        ttl: Optional[float] = None,
+        sources: Sequence[str] = (),
+        env: Sequence[str] = (),
+    ):
+        """
+        Initialize policy
+        
+        Args:
+            kind: One of never, ttl, boot or validator
+            ttl: Maximum age in seconds for ttl policies
+            sources: Files whose inode, mtime and size validate the value;
+                boot policies are also invalidated when these change
+            env: Environment variables whose values validate the value
+        """
+        self.kind = kind
+        self.ttl = ttl
+        self.sources = list(sources)
+        self.env = list(env)
+    
+    def __repr__(self) -> str:
+        return (
+            f"CachePolicy({self.kind!r}, ttl={self.ttl!r}, "
+            f"sources={self.sources!r}, env={self.env!r})"
+        )
+    
+    @classmethod
+    def parse(cls, spec: Any, default_ttl: float = 300) -> "CachePolicy":
+        """
+        Build a policy from a config value
+        
+        Accepted forms are "never", "boot", "ttl", a number of seconds,
+        a list of source files, or a dict with "ttl" or "sources" keys.
+        A dict with "boot": true makes a boot policy that is also
+        validated by its "sources" and "env".
+        """
+        if isinstance(spec, cls):
+            return spec
+        if spec is None or spec is False or spec == cls.NEVER:
+            return cls(cls.NEVER)
+        if spec == cls.BOOT:
+            return cls(cls.BOOT)
+        if spec == cls.TTL or spec is True:
+            return cls(cls.TTL, ttl=default_ttl)
+        if isinstance(spec, (int, float)):
+            return cls(cls.TTL, ttl=spec) if spec > 0 else cls(cls.NEVER)
+        if isinstance(spec, list):
+            return cls(cls.VALIDATOR, sources=spec)
+        if isinstance(spec, dict):
+            if spec.get("boot"):
+                return cls(cls.BOOT, sources=spec.get("sources", ()), env=spec.get("env", ()))
+            if "sources" in spec:
+                return cls(cls.VALIDATOR, sources=spec["sources"], env=spec.get("env", ()))
+            if "ttl" in spec:
+                return cls.parse(spec["ttl"], default_ttl)
+        return cls(cls.NEVER)
+    
+    def token(self) -> Optional[Any]:
+        """Get the value that must match for a cached entry to be valid"""
+        if self.kind == self.BOOT:
+            boot = boot_id()
+            if boot is None or not (self.sources or self.env):
+                return boot
+            return [boot] + self._validators()
+        if self.kind == self.VALIDATOR:
+            return self._validators()
+        return None
+    
+    def _validators(self) -> List[Any]:
+        """Get the stat tokens of the sources and the values of env"""
+        tokens: List[Any] = [_stat_token(path) for path in self.sources]
+        if self.env:
+            tokens.append([os.environ.get(name) for name in self.env])
+        return tokens
+    
+    def load(self, key: str) -> Optional[Any]:
+        """
+        Get the cached value for key if it is valid under this policy
+        
+        Returns:
+            Cached value or None on a miss or when caching is bypassed
+        """
+        if self.kind == self.NEVER or not _cache_enabled or _cache_refresh:
+            return None
+        
+        cache = get_cache()
+        if self.kind == self.TTL:
+            entry = cache.get(key, max_age=self.ttl)
+        else:
+            entry = cache.get(key, expire=False)
+        
+        if not isinstance(entry, dict):
+            return None
+        token = self.token()
+        if self.kind in (self.BOOT, self.VALIDATOR):
+            if token is None or entry.get("token") != token:
+                return None
+        return entry.get("value")
+    
+    def load_stale(self, key: str) -> Optional[Any]:
+        """Get the cached value for key even if it is no longer valid"""
+        if self.kind == self.NEVER or not _cache_enabled:
+            return None
+        entry = get_cache().get(key, expire=False)
+        return entry.get("value") if isinstance(entry, dict) else None
+    
+    def store(self, key: str, value: Any) -> None:
+        """Cache value for key under this policy"""
+        if self.kind == self.NEVER or not _cache_enabled:
+            return
+        token = self.token()
+        if self.kind == self.BOOT and token is None:
+            return
+        get_cache().set(key, {"token": token, "value": value})
@@ -0,0 +1,527 @@
+"""
+Concurrent collection engine for system information
+"""
+import threading
+import time
+from collections.abc import Mapping
+from queue import Queue, Empty
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from . import info, tracing
+from .cache import CachePolicy
+from .utils import kill_running, set_exec_cancelled
+
+
+# Field label -> collector, in default display order
+COLLECTORS: Dict[str, Callable[[], Any]] = {
+    "User": info.get_user_host,
+    "Host": info.get_host,
+    "OS": info.get_os,
+    "Kernel": info.get_kernel,
+    "Uptime": info.get_uptime,
+    "Packages": info.get_packages,
+    "Shell": info.get_shell,
+    "Resolution": info.get_resolution,
+    "DE": info.get_desktop_env,
+    "WM": info.get_window_manager,
+    "Terminal": info.get_terminal,
+    "CPU": info.get_cpu,
+    "GPU": info.get_gpu,
+    "Memory": info.get_memory,
+    "Swap": info.get_swap,
+    "Disk": info.get_disk,
+    "Local IP": info.get_ip,
+    "Battery": info.get_battery,
+    "Locale": info.get_locale,
+}
+
+# Default caching policy per field; anything not listed is never cached.
+# Values use the same forms as performance.cache_policies in the config.
+# CPU and GPU cache their model per boot internally and read the
+# frequency live, so they have no field-level policy.
+DEFAULT_POLICIES: Dict[str, Any] = {
+    "Host": {
+        "boot": True,
+        "sources": ["/sys/class/dmi/id/product_name", "/sys/class/dmi/id/product_version"],
+    },
+    "OS": {"boot": True, "sources": ["/etc/os-release"]},
+    "Kernel": CachePolicy.BOOT,
+    "Packages": CachePolicy.TTL,
+    "Locale": {"boot": True, "env": ["LC_ALL", "LC_CTYPE", "LANG"]},
+}
+
+# Default refresh interval in seconds for fields that change while running
+REFRESH_INTERVALS: Dict[str, float] = {
+    "Uptime": 30,
+    "Memory": 2,
+    "Swap": 5,
+    "CPU": 2,
+    "Battery": 30,
+    "Local IP": 10,
+}
+
+# Fields describing the calling process (its environment and parent);
+# a daemon collects them per request from the context its client sends
+CALLER_COLLECTORS: Dict[str, Callable[[Dict[str, str], int], Any]] = {
+    "User": lambda environ, ppid: info.get_user_host(environ),
+    "Shell": lambda environ, ppid: info.get_shell(environ),
+    "DE": lambda environ, ppid: info.get_desktop_env(environ),
+    "Terminal": info.get_terminal,
+    "Locale": lambda environ, ppid: info.get_locale(environ),
+}
+
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 5.0
+
+# Value reported for a collector that failed or ran out of time
+FAILED_VALUE = "Unknown"
+
+# Value shown for a field unfinished at the deadline with nothing cached
+PENDING_VALUE = "Timed out"
+
+# Appended to a cached value shown because collection missed the deadline
+STALE_MARKER = " (stale)"
+
+
+class _Task:
+    """A single collector invocation handed to a worker thread"""
+
+    __slots__ = (
+        "label", "func", "timeout", "started", "done", "start_time", "value", "cancelled",
+    )
+
+    def __init__(self, label: str, func: Callable[[], Any], timeout: float):
+        self.label = label
+        self.func = func
+        self.timeout = timeout
+        self.started = threading.Event()
+        self.done = threading.Event()
+        self.start_time = 0.0
+        self.value: Any = FAILED_VALUE
+        self.cancelled = False
+
+
+def _worker(queue: "Queue[_Task]") -> None:
+    """Run queued tasks until the queue is drained"""
+    while True:
+        try:
+            task = queue.get_nowait()
+        except Empty:
+            return
+        if task.cancelled:
+            continue
+
+        task.start_time = time.monotonic()
+        task.started.set()
+        set_exec_cancelled(lambda: task.cancelled)
+        try:
+            task.value = task.func()
+        except Exception:
+            task.value = FAILED_VALUE
+        finally:
+            set_exec_cancelled(None)
+        task.done.set()
+
+
+def _spawn_worker(queue: "Queue[_Task]") -> None:
+    """
+    Start a daemon worker thread
+
+    Workers are daemon threads so a collector stuck in a syscall can never
+    keep the interpreter alive after its result has been given up on.
+    """
+    thread = threading.Thread(target=_worker, args=(queue,), daemon=True)
+    thread.start()
+
+
+def cache_key(label: str) -> str:
+    """Get the cache key used for a field"""
+    return "field_" + label.lower().replace(" ", "_")
+
+
+def cache_policies(
+    overrides: Optional[Dict[str, Any]] = None, default_ttl: float = 300
+) -> Dict[str, CachePolicy]:
+    """
+    Resolve the caching policy of every field
+
+    Args:
+        overrides: Per-field policy specs from config
+        default_ttl: TTL in seconds for fields using the "ttl" policy
+
+    Returns:
+        Mapping of field label to CachePolicy
+    """
+    specs = dict(DEFAULT_POLICIES)
+    specs.update(overrides or {})
+    return {
+        label: CachePolicy.parse(specs.get(label), default_ttl)
+        for label in COLLECTORS
+    }
+
+
+def collect_caller(
+    labels: Iterable[str], environ: Dict[str, str], ppid: int
+) -> Dict[str, Any]:
+    """
+    Collect caller-dependent fields for another process
+
+    Args:
+        labels: Field labels; those not in CALLER_COLLECTORS are skipped
+        environ: The caller's environment variables
+        ppid: The caller's parent process id
+
+    Returns:
+        Mapping of field label to value
+    """
+    values = {}
+    for label in labels:
+        func = CALLER_COLLECTORS.get(label)
+        if func is None:
+            continue
+        try:
+            values[label] = func(environ, ppid)
+        except Exception:
+            values[label] = FAILED_VALUE
+    return values
+
+
+def refresh_intervals(
+    overrides: Optional[Dict[str, float]] = None, default: Optional[float] = None
+) -> Dict[str, float]:
+    """
+    Resolve the refresh interval of every volatile field
+
+    Args:
+        overrides: Per-field intervals in seconds from config; 0 disables
+        default: Interval replacing the built-in per-field defaults
+    """
+    intervals = dict(REFRESH_INTERVALS)
+    if default:
+        intervals = {label: default for label in intervals}
+    intervals.update(overrides or {})
+    return {label: seconds for label, seconds in intervals.items() if seconds}
+
+
+def run_collectors(
+    collectors: Dict[str, Callable[[], Any]],
+    max_workers: int = DEFAULT_WORKERS,
+    timeout: float = DEFAULT_TIMEOUT,
+    timeouts: Optional[Dict[str, float]] = None,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Run collectors concurrently on a bounded pool of worker threads
+
+    Args:
+        collectors: Mapping of field label to collector function
+        max_workers: Maximum number of concurrently running collectors
+        timeout: Default per-collector timeout in seconds
+        timeouts: Per-label timeout overrides in seconds
+        deadline: time.monotonic() value after which unfinished collectors
+            are abandoned and the commands they run are killed
+
+    Returns:
+        Mapping of field label to value, in the order of ``collectors``;
+        collectors abandoned at the deadline are left out
+    """
+    timeouts = timeouts or {}
+    tasks = [
+        _Task(label, func, timeouts.get(label, timeout))
+        for label, func in collectors.items()
+    ]
+    if not tasks:
+        return {}
+
+    queue: "Queue[_Task]" = Queue()
+    for task in tasks:
+        queue.put(task)
+    for _ in range(max(1, min(max_workers, len(tasks)))):
+        _spawn_worker(queue)
+
+    def until_deadline() -> Optional[float]:
+        return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+    results = {}
+    missed = False
+    for task in tasks:
+        if not task.started.wait(until_deadline()):
+            missed = True
+            break
+        remaining = task.timeout - (time.monotonic() - task.start_time)
+        left = until_deadline()
+        if left is not None and left < remaining:
+            if task.done.wait(left):
+                results[task.label] = task.value
+            else:
+                missed = True
+                break
+        elif task.done.wait(max(0.0, remaining)):
+            results[task.label] = task.value
+        else:
+            # The worker is stuck: stop it from starting more commands,
+            # kill the ones it runs and replace it so queued tasks still run
+            task.cancelled = True
+            kill_running(cancelled_only=True)
+            results[task.label] = FAILED_VALUE
+            _spawn_worker(queue)
+
+    if missed:
+        # Keep whatever else finished in time and abandon the rest
+        for task in tasks:
+            if task.label in results:
+                continue
+            if task.done.is_set():
+                results[task.label] = task.value
+            else:
+                task.cancelled = True
+        kill_running(cancelled_only=True)
+        results = {task.label: results[task.label] for task in tasks if task.label in results}
+    return results
+
+
+def collect(
+    fields: Optional[Iterable[str]] = None,
+    max_workers: int = DEFAULT_WORKERS,
+    timeout: float = DEFAULT_TIMEOUT,
+    timeouts: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """
+    Collect the given fields concurrently
+
+    Args:
+        fields: Field labels to collect, in output order (default: all)
+        max_workers: Maximum number of concurrently running collectors
+        timeout: Default per-collector timeout in seconds
+        timeouts: Per-label timeout overrides in seconds
+
+    Returns:
+        Mapping of field label to value, in the requested order
+    """
+    labels: List[str] = list(fields) if fields is not None else list(COLLECTORS)
+    collectors = {
+        label: COLLECTORS[label] for label in labels if label in COLLECTORS
+    }
+    return run_collectors(collectors, max_workers, timeout, timeouts)
+
+
+class Snapshot(Mapping):
+    """
+    System information collected once per run and shared by every renderer
+
+    Collection is lazy: nothing runs until a value is first requested, and
+    only the fields the snapshot was created for are ever collected.
+    """
+
+    def __init__(
+        self,
+        fields: Optional[Iterable[str]] = None,
+        max_workers: int = DEFAULT_WORKERS,
+        timeout: float = DEFAULT_TIMEOUT,
+        timeouts: Optional[Dict[str, float]] = None,
+        policies: Optional[Dict[str, CachePolicy]] = None,
+        deadline: Optional[float] = None,
+        revalidate: bool = False,
+    ):
+        """
+        Args:
+            fields: Field labels to collect, in output order (default: all)
+            max_workers: Maximum number of concurrently running collectors
+            timeout: Default per-collector timeout in seconds
+            timeouts: Per-label timeout overrides in seconds
+            policies: Cache policy per field label
+            deadline: Seconds a collection may take in total; fields still
+                running then show their last cached value or a placeholder.
+                The first collection counts from origin when it is set
+            revalidate: Show expired TTL-cached values and refresh them in
+                a detached background process instead of collecting now
+        """
+        labels = list(fields) if fields is not None else list(COLLECTORS)
+        self.fields: List[str] = [label for label in labels if label in COLLECTORS]
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self.policies = policies or {}
+        self.deadline = deadline or None
+        # time.monotonic() the first deadline is measured from (default:
+        # when collection starts)
+        self.origin: Optional[float] = None
+        self.missed: List[str] = []
+        self.revalidate = revalidate
+        self.config_path: Optional[str] = None
+        self._values: Dict[str, Any] = {}
+        self._collected_at: Dict[str, float] = {}
+
+    @classmethod
+    def from_config(
+        cls, config, fields: Optional[Iterable[str]] = None, revalidate: bool = False
+    ) -> "Snapshot":
+        """
+        Create a snapshot using the performance settings from config
+
+        Args:
+            config: Config instance
+            fields: Field labels to collect (default: enabled fields)
+            revalidate: Allow stale-while-revalidate, if enabled in config
+        """
+        if fields is None:
+            fields = config.get("fields", "enabled") or list(COLLECTORS)
+        policies = {}
+        if config.get("performance", "cache_enabled", default=True):
+            policies = cache_policies(
+                config.get("performance", "cache_policies", default={}),
+                config.get("performance", "cache_duration", default=300),
+            )
+        snapshot = cls(
+            fields,
+            max_workers=config.get("performance", "max_workers", default=DEFAULT_WORKERS),
+            timeout=config.get("performance", "collector_timeout", default=DEFAULT_TIMEOUT),
+            timeouts=config.get("performance", "collector_timeouts", default={}),
+            policies=policies,
+            deadline=(config.get("performance", "deadline_ms", default=0) or 0) / 1000,
+            revalidate=revalidate
+            and config.get("performance", "stale_while_revalidate", default=True),
+        )
+        snapshot.config_path = config.config_file
+        return snapshot
+
+    def _cacheable(self, label: str) -> bool:
+        """Whether a field has a cache policy that can store values"""
+        policy = self.policies.get(label)
+        return policy is not None and policy.kind != CachePolicy.NEVER
+
+    def _fill(self, labels: List[str], max_workers: int) -> None:
+        """Load labels from cache where valid and collect the rest"""
+        start = time.monotonic()
+        profiler = tracing.active()
+        missing = []
+        expired = []
+        for label in labels:
+            policy = self.policies.get(label)
+            if not self._cacheable(label):
+                value = None
+            elif profiler is not None:
+                with profiler.span(label, "cache") as span:
+                    value = policy.load(cache_key(label))
+                    span.cache = "miss" if value is None else "hit"
+            else:
+                value = policy.load(cache_key(label))
+            if (value is None and self.revalidate and policy is not None
+                    and policy.kind == CachePolicy.TTL):
+                value = policy.load_stale(cache_key(label))
+                if value is not None:
+                    expired.append(label)
+            if value is None:
+                missing.append(label)
+            else:
+                self._values[label] = value
+
+        if expired:
+            from . import revalidate
+            if not revalidate.supported():
+                # Without a lock there is no background refresher
+                for label in expired:
+                    missing.append(label)
+                    del self._values[label]
+            else:
+                revalidate.spawn(expired, self.config_path)
+
+        collectors = {label: COLLECTORS[label] for label in missing}
+        if profiler is not None:
+            collectors = {
+                label: profiler.wrap(
+                    label, func, cache="miss" if self._cacheable(label) else None
+                )
+                for label, func in collectors.items()
+            }
+        origin = start if self.origin is None else self.origin
+        # Later refreshes get the whole deadline again
+        self.origin = None
+        deadline = origin + self.deadline if self.deadline else None
+        values = run_collectors(
+            collectors, max_workers, self.timeout, self.timeouts, deadline
+        )
+        for label, value in values.items():
+            self._values[label] = value
+            policy = self.policies.get(label)
+            if policy and value != FAILED_VALUE:
+                policy.store(cache_key(label), value)
+
+        # Fields abandoned at the deadline
+        self.missed = [label for label in missing if label not in values]
+        for label in self.missed:
+            policy = self.policies.get(label)
+            stale = policy.load_stale(cache_key(label)) if self._cacheable(label) else None
+            self._values[label] = PENDING_VALUE if stale is None else f"{stale}{STALE_MARKER}"
+
+        now = time.monotonic()
+        for label in labels:
+            self._collected_at[label] = now
+
+    def resolve(self) -> Dict[str, Any]:
+        """Collect any missing fields and return all values in field order"""
+        missing = [label for label in self.fields if label not in self._values]
+        if missing:
+            self._fill(missing, self.max_workers)
+        return {label: self._values[label] for label in self.fields}
+
+    def __getitem__(self, label: str) -> Any:
+        if label not in self.fields:
+            raise KeyError(label)
+        if label not in self._values:
+            self._fill([label], 1)
+        return self._values[label]
+
+    def refresh(self, labels: Iterable[str]) -> None:
+        """
+        Recollect the given fields
+
+        Cache policies still apply, so cached fields are only recollected
+        once their cached value is no longer valid.
+        """
+        labels = [label for label in labels if label in self.fields]
+        if labels:
+            self._fill(labels, self.max_workers)
+
+    def due(self, intervals: Dict[str, float], now: Optional[float] = None) -> List[str]:
+        """
+        Get fields whose refresh interval has elapsed since collection
+
+        Args:
+            intervals: Refresh interval in seconds per field label
+            now: time.monotonic() value to compare against
+        """
+        now = time.monotonic() if now is None else now
+        return [
+            label
+            for label in self.fields
+            if label in intervals
+            and now - self._collected_at.get(label, float("-inf")) >= intervals[label]
+        ]
+
+    def next_due(self, intervals: Dict[str, float], now: Optional[float] = None) -> float:
+        """Get seconds until the next field is due for refresh"""
+        now = time.monotonic() if now is None else now
+        waits = [
+            intervals[label] - (now - self._collected_at.get(label, float("-inf")))
+            for label in self.fields
+            if label in intervals
+        ]
+        return max(0.0, min(waits)) if waits else float("inf")
+
+    def __contains__(self, label: object) -> bool:
+        return label in self.fields
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def items(self):
+        """Collect and return (label, value) pairs in field order"""
+        return self.resolve().items()
+
+    def values(self):
+        """Collect and return values in field order"""
+        return self.resolve().values()
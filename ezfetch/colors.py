@@ -1,7 +1,7 @@
 """
 Color handling and theming for ezfetch
 """
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 
 class Colors:
@@ -107,62 +107,204 @@ def get_color(cls, name: str) -> str:
         return getattr(cls, name_upper, "")
 
 
+# Color depths, in bits per color
+DEPTH_NONE = 0
+DEPTH_16 = 4
+DEPTH_256 = 8
+DEPTH_TRUECOLOR = 24
+
+# xterm's default RGB values of the 16 basic colors, in SGR order
+# (30-37, then 90-97)
+PALETTE_16 = [
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+    (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+    (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+]
+
+
+def color_depth(environ: Optional[Dict[str, str]] = None) -> int:
+    """
+    Detect the color depth of the terminal from the environment
+    
+    Honors NO_COLOR (https://no-color.org), then COLORTERM for truecolor
+    and TERM for 256-color support.
+    
+    Returns:
+        DEPTH_NONE, DEPTH_16, DEPTH_256 or DEPTH_TRUECOLOR
+    """
+    import os
+    
+    env = os.environ if environ is None else environ
+    if env.get("NO_COLOR"):
+        return DEPTH_NONE
+    term = env.get("TERM", "")
+    if term == "dumb":
+        return DEPTH_NONE
+    if env.get("COLORTERM", "").lower() in ("truecolor", "24bit"):
+        return DEPTH_TRUECOLOR
+    if "256color" in term:
+        return DEPTH_256
+    if not term and env.get("WT_SESSION"):
+        # Windows Terminal sets neither TERM nor COLORTERM
+        return DEPTH_TRUECOLOR
+    return DEPTH_16
+
+
+def rgb_to_256(r: int, g: int, b: int) -> int:
+    """Map an RGB color to the nearest xterm 256-color index"""
+    if r == g == b:
+        if r < 8:
+            return 16
+        if r > 248:
+            return 231
+        return 232 + round((r - 8) / 247 * 24)
+    return 16 + 36 * round(r / 255 * 5) + 6 * round(g / 255 * 5) + round(b / 255 * 5)
+
+
+def rgb_to_16(r: int, g: int, b: int) -> int:
+    """Map an RGB color to the SGR foreground code of the nearest basic color"""
+    index = min(
+        range(len(PALETTE_16)),
+        key=lambda i: sum((c - p) ** 2 for c, p in zip((r, g, b), PALETTE_16[i])),
+    )
+    return 30 + index if index < 8 else 90 + index - 8
+
+
+def rgb_code(r: int, g: int, b: int, depth: int) -> str:
+    """Get the foreground escape code of an RGB color at a color depth"""
+    if depth >= DEPTH_TRUECOLOR:
+        return Colors.rgb(r, g, b)
+    if depth >= DEPTH_256:
+        return f"\033[38;5;{rgb_to_256(r, g, b)}m"
+    if depth > DEPTH_NONE:
+        return f"\033[{rgb_to_16(r, g, b)}m"
+    return ""
+
+
 class Theme:
     """Color theme for ezfetch display"""
     
+    # Element colors as hex strings, color names or ANSI codes; themes are
+    # compiled to escape codes for the terminal's color depth on first use
     THEMES: Dict[str, Dict[str, str]] = {
         "default": {
-            "label": Colors.BRIGHT_GREEN,
-            "value": Colors.BRIGHT_CYAN,
-            "logo": Colors.CYAN,
-            "separator": Colors.WHITE,
+            "label": "bright_green",
+            "value": "bright_cyan",
+            "logo": "cyan",
+            "separator": "white",
         },
         "nord": {
-            "label": Colors.from_hex("#88C0D0"),
-            "value": Colors.from_hex("#ECEFF4"),
-            "logo": Colors.from_hex("#5E81AC"),
-            "separator": Colors.from_hex("#D8DEE9"),
+            "label": "#88C0D0",
+            "value": "#ECEFF4",
+            "logo": "#5E81AC",
+            "separator": "#D8DEE9",
         },
         "dracula": {
-            "label": Colors.from_hex("#FF79C6"),
-            "value": Colors.from_hex("#F8F8F2"),
-            "logo": Colors.from_hex("#BD93F9"),
-            "separator": Colors.from_hex("#6272A4"),
+            "label": "#FF79C6",
+            "value": "#F8F8F2",
+            "logo": "#BD93F9",
+            "separator": "#6272A4",
         },
         "gruvbox": {
-            "label": Colors.from_hex("#B8BB26"),
-            "value": Colors.from_hex("#EBDBB2"),
-            "logo": Colors.from_hex("#83A598"),
-            "separator": Colors.from_hex("#A89984"),
+            "label": "#B8BB26",
+            "value": "#EBDBB2",
+            "logo": "#83A598",
+            "separator": "#A89984",
         },
         "monokai": {
-            "label": Colors.from_hex("#A6E22E"),
-            "value": Colors.from_hex("#F8F8F2"),
-            "logo": Colors.from_hex("#66D9EF"),
-            "separator": Colors.from_hex("#75715E"),
+            "label": "#A6E22E",
+            "value": "#F8F8F2",
+            "logo": "#66D9EF",
+            "separator": "#75715E",
         },
         "solarized": {
-            "label": Colors.from_hex("#859900"),
-            "value": Colors.from_hex("#93A1A1"),
-            "logo": Colors.from_hex("#268BD2"),
-            "separator": Colors.from_hex("#586E75"),
+            "label": "#859900",
+            "value": "#93A1A1",
+            "logo": "#268BD2",
+            "separator": "#586E75",
         },
     }
     
-    def __init__(self, theme_name: str = "default"):
+    # Compiled themes per (theme name, color depth)
+    _compiled: Dict[Tuple[str, int], Dict[str, str]] = {}
+    
+    def __init__(self, theme_name: str = "default", depth: Optional[int] = None):
         """
         Initialize theme
         
         Args:
             theme_name: Name of the theme to use
+            depth: Color depth to compile for (default: detected)
         """
+        if theme_name not in self.THEMES:
+            theme_name = "default"
         self.theme_name = theme_name
-        self.colors = self.THEMES.get(theme_name, self.THEMES["default"])
+        self.depth = color_depth() if depth is None else depth
+        self.colors = self.compile(theme_name, self.depth)
+    
+    @classmethod
+    def register(cls, themes: Dict[str, Dict[str, str]]) -> None:
+        """
+        Add user-defined themes, e.g. from the "themes" config section
+        
+        Args:
+            themes: Theme name to {element: color} mapping
+        """
+        for name, spec in (themes or {}).items():
+            if isinstance(spec, dict):
+                cls.THEMES[name] = {
+                    element: color for element, color in spec.items()
+                    if isinstance(color, str)
+                }
+                for key in [key for key in cls._compiled if key[0] == name]:
+                    del cls._compiled[key]
+    
+    @staticmethod
+    def resolve(color: str, depth: int = DEPTH_TRUECOLOR) -> str:
+        """Turn a hex string, color name or ANSI code into an ANSI code"""
+        if depth <= DEPTH_NONE:
+            return ""
+        if color.startswith("#"):
+            try:
+                r, g, b = Colors.hex_to_rgb(color)
+            except ValueError:
+                return ""
+            return rgb_code(r, g, b, depth)
+        if not color.startswith("\033"):
+            return Colors.get_color(color)
+        return color
+    
+    @classmethod
+    def compile(cls, theme_name: str, depth: int) -> Dict[str, str]:
+        """
+        Compile a theme to escape codes for a color depth
+        
+        Compiled themes are kept in memory per theme and depth, and
+        recompiled when the theme is registered again.
+        
+        Returns:
+            Mapping of element to escape code ("" for no color)
+        """
+        key = (theme_name, depth)
+        colors = cls._compiled.get(key)
+        if colors is None:
+            colors = {
+                element: cls.resolve(color, depth)
+                for element, color in cls.THEMES[theme_name].items()
+            }
+            cls._compiled[key] = colors
+        return colors
     
     def get(self, element: str) -> str:
-        """Get color for a theme element"""
+        """Get the escape code that starts an element's color"""
         return self.colors.get(element, "")
     
+    def wrap(self, element: str) -> Tuple[str, str]:
+        """Get the (prefix, suffix) escape codes surrounding an element"""
+        prefix = self.colors.get(element, "")
+        return prefix, Colors.RESET if prefix else ""
+    
     @classmethod
     def list_themes(cls) -> list:
         """Get list of available theme names"""
@@ -3,7 +3,6 @@
 """
 import json
 import os
-from pathlib import Path
 from typing import Dict, Any, Optional
 
 
@@ -19,6 +18,8 @@
         "value_color": "bright_cyan",
         "logo_color": "cyan",
     },
+    # User-defined themes: {"name": {"label": "#RRGGBB", "value": ..., ...}}
+    "themes": {},
     "fields": {
         "enabled": [
             "User",
@@ -47,6 +48,13 @@
     "performance": {
         "cache_enabled": True,
         "cache_duration": 300,  # 5 minutes
+        "cache_policies": {},  # per-field: "never", "boot", seconds, [files]
+        "max_workers": 8,
+        "collector_timeout": 5.0,  # seconds, per collector
+        "collector_timeouts": {},  # per-field overrides
+        "refresh_intervals": {},  # per-field seconds, for --daemon
+        "deadline_ms": 0,  # render partial results after this long; 0 waits
+        "stale_while_revalidate": True,  # show expired values, refresh in background
     },
 }
 
@@ -55,17 +63,18 @@ class Config:
     """Configuration manager for ezfetch"""
 
     def __init__(self, config_path: Optional[str] = None):
-        self.config_dir = Path.home() / ".config" / "ezfetch"
-        self.config_file = self.config_dir / "config.json"
+        # Plain os.path strings keep pathlib out of every startup
+        self.config_dir = os.path.join(os.path.expanduser("~"), ".config", "ezfetch")
+        self.config_file = os.path.join(self.config_dir, "config.json")
         
         if config_path:
-            self.config_file = Path(config_path)
+            self.config_file = config_path
         
         self.config = self._load_config()
 
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file or use defaults"""
-        if self.config_file.exists():
+        if os.path.exists(self.config_file):
             try:
                 with open(self.config_file, "r") as f:
                     user_config = json.load(f)
@@ -107,7 +116,7 @@ def set(self, *keys: str, value: Any) -> None:
 
     def save(self) -> None:
         """Save configuration to file"""
-        self.config_dir.mkdir(parents=True, exist_ok=True)
+        os.makedirs(self.config_dir, exist_ok=True)
         try:
             with open(self.config_file, "w") as f:
                 json.dump(self.config, f, indent=2)
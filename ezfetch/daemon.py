@@ -0,0 +1,253 @@
+"""
+Resident daemon serving warm snapshots over a Unix socket
+"""
+import json
+import os
+import socket
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+
+from . import __version__
+
+
+SOCKET_NAME = "ezfetch.sock"
+
+# Client-side connect/read timeout in seconds
+CLIENT_TIMEOUT = 0.5
+
+# Upper bound on a single request line
+MAX_REQUEST = 64 * 1024
+
+# Environment variables the caller-dependent fields are derived from
+CALLER_ENV = (
+    "USER", "USERNAME", "SHELL", "ComSpec", "BASH_VERSION", "ZSH_VERSION",
+    "FISH_VERSION", "XDG_CURRENT_DESKTOP", "DESKTOP_SESSION", "TERM",
+    "LC_ALL", "LC_CTYPE", "LANG",
+)
+
+
+def socket_path() -> str:
+    """
+    Get the daemon socket path
+
+    Uses $XDG_RUNTIME_DIR when set, otherwise a private per-user directory
+    under the system temp dir.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, SOCKET_NAME)
+
+    import tempfile
+
+    uid = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return os.path.join(tempfile.gettempdir(), f"ezfetch-{uid}", SOCKET_NAME)
+
+
+def _trusted_dir(path: str) -> bool:
+    """
+    Check that the socket directory cannot be controlled by another user
+
+    $XDG_RUNTIME_DIR is set up private by the login manager. The temp dir
+    fallback is shared, so another user could create it first; it is only
+    used when it is a real directory owned by us with mode 0700.
+    """
+    import stat
+
+    directory = os.path.dirname(path)
+    if directory == os.environ.get("XDG_RUNTIME_DIR"):
+        return True
+    if not hasattr(os, "getuid"):
+        return True
+    try:
+        st = os.lstat(directory)
+    except OSError:
+        return False
+    return (
+        stat.S_ISDIR(st.st_mode)
+        and st.st_uid == os.getuid()
+        and stat.S_IMODE(st.st_mode) == 0o700
+    )
+
+
+def fetch(fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Fetch a snapshot from a running daemon
+
+    Args:
+        fields: Field labels to fetch, in output order (default: all)
+
+    Returns:
+        Mapping of field label to value, or None if no daemon answered
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    path = socket_path()
+    if not os.path.exists(path) or not _trusted_dir(path):
+        return None
+
+    caller = {
+        "environ": {name: os.environ[name] for name in CALLER_ENV if name in os.environ},
+        "ppid": os.getppid(),
+    }
+    request = json.dumps({"version": __version__, "fields": fields, "caller": caller}) + "\n"
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CLIENT_TIMEOUT)
+            sock.connect(path)
+            sock.sendall(request.encode("utf-8"))
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        response = json.loads(b"".join(chunks).decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(response, dict) or response.get("version") != __version__:
+        return None
+    values = response.get("values")
+    return values if isinstance(values, dict) else None
+
+
+class Daemon:
+    """Keeps a warm snapshot and refreshes volatile fields on schedule"""
+
+    def __init__(self, config):
+        from .collector import CALLER_COLLECTORS, COLLECTORS, Snapshot, refresh_intervals
+
+        self.config = config
+        # Fields that depend on the caller are collected per request
+        self.snapshot = Snapshot.from_config(
+            config, [label for label in COLLECTORS if label not in CALLER_COLLECTORS]
+        )
+        # Volatile fields use their own interval; everything else is
+        # revisited at cache_duration and only recollected once its
+        # cached value is no longer valid
+        static_interval = config.get("performance", "cache_duration", default=300)
+        self.intervals = {label: static_interval for label in COLLECTORS}
+        self.intervals.update(
+            refresh_intervals(config.get("performance", "refresh_intervals", default={}))
+        )
+        self.values: Dict[str, Any] = {}
+        self._stop = threading.Event()
+
+    def _update(self) -> None:
+        """Refresh due fields and publish a new immutable copy of the values"""
+        from .cache import get_cache
+
+        due = self.snapshot.due(self.intervals)
+        if due:
+            self.snapshot.refresh(due)
+            self.values = dict(self.snapshot.items())
+            get_cache().flush()
+
+    def _refresh_loop(self) -> None:
+        """Refresh fields until stopped"""
+        while not self._stop.is_set():
+            try:
+                self._update()
+            except Exception:
+                pass
+            self._stop.wait(max(0.1, self.snapshot.next_due(self.intervals)))
+
+    def respond(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the response for a client request
+
+        Caller-dependent fields are collected from the environment and
+        parent pid in the request; without them they are left out.
+        """
+        from .collector import COLLECTORS, collect_caller
+
+        labels = request.get("fields") or list(COLLECTORS)
+        caller = request.get("caller")
+        local: Dict[str, Any] = {}
+        if isinstance(caller, dict) and isinstance(caller.get("ppid"), int):
+            environ = caller.get("environ")
+            environ = {
+                name: value for name, value in (environ or {}).items()
+                if isinstance(name, str) and isinstance(value, str)
+            } if isinstance(environ, dict) else {}
+            local = collect_caller(labels, environ, caller["ppid"])
+
+        values = self.values
+        return {
+            "version": __version__,
+            "values": {
+                label: local[label] if label in local else values[label]
+                for label in labels
+                if label in local or label in values
+            },
+        }
+
+    def serve(self) -> None:
+        """Serve snapshots on the Unix socket until interrupted"""
+        import socketserver
+
+        path = socket_path()
+        if fetch(["User"]) is not None:
+            print(f"ezfetch daemon already running on {path}", file=sys.stderr)
+            sys.exit(1)
+
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        if not _trusted_dir(path):
+            print(
+                f"ezfetch daemon: refusing to use {os.path.dirname(path)}: "
+                "not a private directory owned by this user",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        if os.path.exists(path):
+            os.unlink(path)
+
+        self.values = dict(self.snapshot.items())
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline(MAX_REQUEST)
+                try:
+                    request = json.loads(line.decode("utf-8") or "{}")
+                except ValueError:
+                    return
+                if not isinstance(request, dict):
+                    return
+                response = json.dumps(daemon.respond(request)) + "\n"
+                self.wfile.write(response.encode("utf-8"))
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        refresher = threading.Thread(target=self._refresh_loop, daemon=True)
+        old_umask = os.umask(0o077)
+        try:
+            server = Server(path, Handler)
+        finally:
+            os.umask(old_umask)
+
+        refresher.start()
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._stop.set()
+            server.server_close()
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def run_daemon(config) -> None:
+    """Run the ezfetch daemon in the foreground"""
+    import signal
+
+    def _terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _terminate)
+    Daemon(config).serve()
@@ -0,0 +1,178 @@
+"""
+Mounted filesystem discovery from /proc/self/mountinfo
+"""
+import os
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+
+MOUNTINFO = "/proc/self/mountinfo"
+
+# Filesystems that never hold user data
+PSEUDO_FS = {
+    "autofs", "binfmt_misc", "bpf", "cgroup", "cgroup2", "configfs", "debugfs",
+    "devpts", "devtmpfs", "efivarfs", "fusectl", "hugetlbfs", "mqueue", "nsfs",
+    "proc", "pstore", "ramfs", "rpc_pipefs", "securityfs", "selinuxfs",
+    "squashfs", "sysfs", "tmpfs", "tracefs", "fuse.gvfsd-fuse", "fuse.lxcfs",
+    "fuse.portal", "fuse.snapfuse",
+}
+
+# Mount point trees that only hold pseudo or per-process filesystems;
+# /run/media/ is left out, udisks2 mounts removable media there
+PSEUDO_PREFIXES = (
+    "/proc/", "/sys/", "/dev/", "/run/user/", "/run/lock/", "/run/credentials/",
+    "/run/netns/", "/run/snapd/", "/run/docker/",
+)
+
+# Overall time allowed for statvfs on every mount
+STATVFS_TIMEOUT = 1.0
+
+
+class Mount(NamedTuple):
+    """A mounted filesystem"""
+
+    device: str
+    root: str
+    mountpoint: str
+    fstype: str
+    source: str
+
+
+class Usage(NamedTuple):
+    """Space usage of a filesystem in bytes"""
+
+    total: int
+    used: int
+    free: int
+
+
+def _unescape(field: str) -> str:
+    """Decode the octal escapes (\\040 etc.) the kernel uses in mountinfo"""
+    if "\\" not in field:
+        return field
+    out = []
+    i = 0
+    while i < len(field):
+        if field[i] == "\\" and field[i + 1:i + 4].isdigit():
+            out.append(chr(int(field[i + 1:i + 4], 8)))
+            i += 4
+        else:
+            out.append(field[i])
+            i += 1
+    return "".join(out)
+
+
+def parse_mountinfo(path: str = MOUNTINFO) -> List[Mount]:
+    """
+    Parse every mount from mountinfo
+
+    Returns:
+        Mounts in mount order
+    """
+    mounts = []
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                fields = line.split()
+                try:
+                    separator = fields.index("-", 6)
+                except ValueError:
+                    continue
+                if len(fields) < separator + 3:
+                    continue
+                mounts.append(Mount(
+                    device=fields[2],
+                    root=_unescape(fields[3]),
+                    mountpoint=_unescape(fields[4]),
+                    fstype=fields[separator + 1],
+                    source=_unescape(fields[separator + 2]),
+                ))
+    except OSError:
+        return []
+    return mounts
+
+
+def _rank(mount: Mount) -> tuple:
+    """Sort key preferring the mount of a device's root, then short paths"""
+    return (mount.root != "/", len(mount.mountpoint))
+
+
+def real_mounts(mounts: Optional[List[Mount]] = None) -> List[Mount]:
+    """
+    Filter pseudo filesystems and duplicate bind mounts
+
+    Of several mounts of the same device, the one exposing the
+    filesystem root (then the shortest mount point) is kept. A mount
+    point mounted over several times keeps its topmost mount.
+
+    Returns:
+        Mounts holding data, "/" first
+    """
+    mounts = parse_mountinfo() if mounts is None else mounts
+
+    # Later mounts hide earlier ones on the same mount point
+    visible: Dict[str, Mount] = {}
+    for mount in mounts:
+        visible[mount.mountpoint] = mount
+
+    by_device: Dict[str, Mount] = {}
+    for mount in visible.values():
+        if mount.fstype in PSEUDO_FS or mount.mountpoint.startswith(PSEUDO_PREFIXES):
+            continue
+        if mount.fstype == "overlay" and mount.mountpoint != "/":
+            continue
+        kept = by_device.get(mount.device)
+        if kept is None or _rank(mount) < _rank(kept):
+            by_device[mount.device] = mount
+
+    result = list(by_device.values())
+    result.sort(key=lambda mount: mount.mountpoint != "/")
+    return result
+
+
+def _statvfs(path: str) -> Usage:
+    """Get the space usage of the filesystem mounted at path"""
+    st = os.statvfs(path)
+    total = st.f_blocks * st.f_frsize
+    free = st.f_bavail * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    return Usage(total, used, free)
+
+
+def usage(paths: List[str], timeout: float = STATVFS_TIMEOUT) -> Dict[str, Optional[Usage]]:
+    """
+    Get space usage of several mount points without risking a hang
+
+    Every statvfs runs on its own daemon thread, so a dead NFS or FUSE
+    mount that blocks forever only costs the timeout and never keeps
+    the process alive.
+
+    Args:
+        paths: Mount points
+        timeout: Overall seconds to wait for all of them
+
+    Returns:
+        Mapping of mount point to Usage, or None if it failed or did not
+        answer in time
+    """
+    results: Dict[str, Optional[Usage]] = {path: None for path in paths}
+    threads = []
+
+    def probe(path: str) -> None:
+        try:
+            results[path] = _statvfs(path)
+        except OSError:
+            pass
+
+    for path in paths:
+        thread = threading.Thread(target=probe, args=(path,), daemon=True)
+        thread.start()
+        threads.append((path, thread))
+
+    deadline = time.monotonic() + timeout
+    answered = {}
+    for path, thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+        answered[path] = results[path] if not thread.is_alive() else None
+    return answered
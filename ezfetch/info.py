@@ -1,69 +1,62 @@
 import os
 import platform
-import socket
-import psutil
-import subprocess
 import time
-import glob
-import shutil
-import ctypes
-import locale
-import shutil
 
+from .api import Battery, Cpu, Disk, Gpu, Packages, Usage
+from .cache import CachePolicy
+from .disks import real_mounts, usage as disk_usage
+from .net import primary_address
+from .osrelease import os_release
+from .packages import count_native
+from .pci import describe, display_devices, lookup_names
+from .utils import format_size, format_uptime, run, run_lines
+from .versions import program_version
 
-def get_user_host():
-    return f"{os.getenv('USER') or os.getenv('USERNAME')}@{socket.gethostname()}"
+
+def current_user(environ=None):
+    """Get the login name from the environment"""
+    environ = os.environ if environ is None else environ
+    return environ.get("USER") or environ.get("USERNAME")
+
+
+def get_user_host(environ=None):
+    import socket
+
+    return f"{current_user(environ)}@{socket.gethostname()}"
+
+
+def host_model():
+    """Get the machine model, or None"""
+    if platform.system() == "Linux":
+        try:
+            with open("/sys/class/dmi/id/product_name", "r") as f:
+                product = f.read().strip()
+            with open("/sys/class/dmi/id/product_version", "r") as f:
+                version = f.read().strip()
+            return f"{product} ({version})"
+        except OSError:
+            return None
+    elif platform.system() == "Darwin":
+        return run("sysctl", "-n", "hw.model")
+    elif platform.system() == "Windows":
+        lines = run_lines("wmic", "computersystem", "get", "model")[1:]
+        model = [line.strip() for line in lines if line.strip()]
+        return model[0] if model else None
+    return None
 
 
 def get_host():
     try:
-        if platform.system() == "Linux":
-            try:
-                with open("/sys/class/dmi/id/product_name", "r") as f:
-                    product = f.read().strip()
-                with open("/sys/class/dmi/id/product_version", "r") as f:
-                    version = f.read().strip()
-                return f"{product} ({version})"
-            except:
-                return "Unknown"
-        elif platform.system() == "Darwin":
-            try:
-                product = subprocess.check_output(
-                    "sysctl -n hw.model",
-                    shell=True,
-                    text=True,
-                    stderr=subprocess.DEVNULL,
-                ).strip()
-                return product
-            except:
-                return "Unknown"
-        elif platform.system() == "Windows":
-            try:
-                output = subprocess.check_output(
-                    "wmic computersystem get model",
-                    shell=True,
-                    text=True,
-                    stderr=subprocess.DEVNULL,
-                )
-                lines = output.strip().split("\n")[1:]
-                model = [line.strip() for line in lines if line.strip()]
-                return model[0] if model else "Unknown"
-            except:
-                return "Unknown"
-        return "Unknown"
+        return host_model() or "Unknown"
     except:
         return "Unknown"
 
 
 def get_os():
     if platform.system() == "Linux":
-        try:
-            with open("/etc/os-release") as f:
-                for line in f:
-                    if line.startswith("PRETTY_NAME="):
-                        return line.split("=")[1].strip().strip('"')
-        except:
-            pass
+        pretty_name = os_release().get("PRETTY_NAME")
+        if pretty_name:
+            return pretty_name
     return platform.system() + " " + platform.release()
 
 
@@ -71,175 +64,110 @@ def get_kernel():
     return platform.release()
 
 
-def get_uptime():
-    uptime_seconds = int(time.time() - psutil.boot_time())
-    days, remainder = divmod(uptime_seconds, 86400)
-    hours, remainder = divmod(remainder, 3600)
-    minutes, seconds = divmod(remainder, 60)
+def uptime_seconds():
+    """Get the time since boot in seconds"""
+    import psutil
+
+    return time.time() - psutil.boot_time()
+
 
-    if days > 0:
-        return f"{days} days, {hours} hours, {minutes} mins"
-    elif hours > 0:
-        return f"{hours} hours, {minutes} mins"
-    else:
-        return f"{minutes} mins"
+def get_uptime():
+    return format_uptime(int(uptime_seconds()))
+
+
+def _count_after(lines, header):
+    """Count non-empty lines after the first line starting with header"""
+    for i, line in enumerate(lines):
+        if line.startswith(header):
+            return sum(1 for rest in lines[i + 1:] if rest.strip())
+    return sum(1 for line in lines if line.strip())
+
+
+def package_count():
+    """Count installed packages of the first manager that reports any, or None"""
+    import shutil
+
+    native = count_native()
+    if native:
+        return Packages(*native)
+    if shutil.which("rpm"):
+        lines = run_lines("rpm", "-qa", timeout=30)
+        if lines:
+            return Packages(len(lines), "rpm")
+    if shutil.which("dnf"):
+        lines = run_lines("dnf", "list", "installed", timeout=30)
+        if lines:
+            return Packages(_count_after(lines, "Installed Packages"), "dnf")
+    if shutil.which("zypper"):
+        lines = run_lines("zypper", "se", "--installed-only", timeout=30)
+        count = sum(1 for line in lines if line[:1] == "i")
+        if count:
+            return Packages(count, "zypper")
+    if shutil.which("flatpak"):
+        lines = run_lines("flatpak", "list", "--columns=application")
+        if lines:
+            return Packages(len(lines), "flatpak")
+    if shutil.which("snap"):
+        lines = run_lines("snap", "list")
+        if lines:
+            return Packages(_count_after(lines, "Name"), "snap")
+    if platform.system() == "Darwin" and shutil.which("brew"):
+        lines = run_lines("brew", "list", "-1", timeout=30)
+        if lines:
+            return Packages(len(lines), "brew")
+    return None
 
 
 def get_packages():
     try:
-        if shutil.which("dpkg"):
-            return (
-                subprocess.check_output(
-                    "dpkg --list | wc -l",
-                    shell=True,
-                    text=True,
-                    stderr=subprocess.DEVNULL,
-                ).strip()
-                + " (dpkg)"
-            )
-        elif shutil.which("rpm"):
-            return (
-                subprocess.check_output(
-                    "rpm -qa | wc -l", shell=True, text=True, stderr=subprocess.DEVNULL
-                ).strip()
-                + " (rpm)"
-            )
-        elif shutil.which("pacman"):
-            return (
-                subprocess.check_output(
-                    "pacman -Q | wc -l",
-                    shell=True,
-                    text=True,
-                    stderr=subprocess.DEVNULL,
-                ).strip()
-                + " (pacman)"
-            )
-        elif shutil.which("apt"):
-            return (
-                subprocess.check_output(
-                    "apt list --installed | wc -l",
-                    shell=True,
-                    text=True,
-                    stderr=subprocess.DEVNULL,
-                ).strip()
-                + " (apt)"
-            )
-        elif shutil.which("dnf"):
-            return (
-                subprocess.check_output(
-                    "dnf list installed | wc -l",
-                    shell=True,
-                    text=True,
-                    stderr=subprocess.DEVNULL,
-                ).strip()
-                + " (dnf)"
-            )
-        elif shutil.which("zypper"):
-            return (
-                subprocess.check_output(
-                    "zypper se --installed-only | wc -l",
-                    shell=True,
-                    text=True,
-                    stderr=subprocess.DEVNULL,
-                ).strip()
-                + " (zypper)"
-            )
-        elif shutil.which("flatpak"):
-            return (
-                subprocess.check_output(
-                    "flatpak list | wc -l",
-                    shell=True,
-                    text=True,
-                    stderr=subprocess.DEVNULL,
-                ).strip()
-                + " (flatpak)"
-            )
-        elif shutil.which("snap"):
-            return (
-                subprocess.check_output(
-                    "snap list | wc -l",
-                    shell=True,
-                    text=True,
-                    stderr=subprocess.DEVNULL,
-                ).strip()
-                + " (snap)"
-            )
-        elif platform.system() == "Darwin":
-            return (
-                subprocess.check_output(
-                    "brew list | wc -l",
-                    shell=True,
-                    text=True,
-                    stderr=subprocess.DEVNULL,
-                ).strip()
-                + " (brew)"
-            )
-            return subprocess.check_output("dpkg --list | wc -l", shell=True, text=True).strip() + " (dpkg)"
-        elif shutil.which("rpm"):
-            return subprocess.check_output("rpm -qa | wc -l", shell=True, text=True).strip() + " (rpm)"
-        elif shutil.which("pacman"):
-            return subprocess.check_output("pacman -Qq | wc -l", shell=True, text=True).strip() + " (pacman)"
-        elif shutil.which("apk"):
-            return subprocess.check_output("apk info | wc -l", shell=True, text=True).strip() + " (apk)"
-        elif platform.system() == "Darwin" and shutil.which("brew"):
-            return subprocess.check_output("brew list | wc -l", shell=True, text=True).strip() + " (brew)"
-        else:
+        packages = package_count()
+        if packages is None:
             return "Unknown"
+        return f"{packages.count} ({packages.manager})"
     except:
         return "Unknown"
 
 
-def get_shell():
-    shell_path = os.environ.get("SHELL") or os.environ.get("ComSpec", "Unknown")
+# Version variables a shell may export to its children
+SHELL_VERSION_VARS = {
+    "bash": "BASH_VERSION",
+    "zsh": "ZSH_VERSION",
+    "fish": "FISH_VERSION",
+}
+
+# Field of "<shell> --version" output holding the version
+SHELL_VERSION_FIELDS = {
+    "bash": 3,
+    "zsh": 1,
+    "fish": 2,
+}
+
+
+def get_shell(environ=None):
+    environ = os.environ if environ is None else environ
+    shell_path = environ.get("SHELL") or environ.get("ComSpec", "Unknown")
     if shell_path != "Unknown":
         shell_name = os.path.basename(shell_path)
-        try:
-            if shell_name == "zsh":
-                version = (
-                    subprocess.check_output(
-                        "zsh --version",
-                        shell=True,
-                        text=True,
-                        stderr=subprocess.DEVNULL,
-                    )
-                    .strip()
-                    .split()[1]
-                )
-                return f"{shell_name} {version}"
-            elif shell_name == "bash":
-                version = (
-                    subprocess.check_output(
-                        "bash --version",
-                        shell=True,
-                        text=True,
-                        stderr=subprocess.DEVNULL,
-                    )
-                    .strip()
-                    .split()[3]
-                    .strip("(")
-                    .strip(")")
-                )
-                return f"{shell_name} {version}"
-            elif shell_name == "fish":
-                version = (
-                    subprocess.check_output(
-                        "fish --version",
-                        shell=True,
-                        text=True,
-                        stderr=subprocess.DEVNULL,
-                    )
-                    .strip()
-                    .split()[2]
-                )
-                return f"{shell_name} {version}"
-            else:
-                return shell_name
-        except:
+        if shell_name not in SHELL_VERSION_FIELDS:
             return shell_name
+
+        # Cheapest first: the parent shell's own version variable
+        version = environ.get(SHELL_VERSION_VARS[shell_name])
+        if not version:
+            field = SHELL_VERSION_FIELDS[shell_name]
+            program = shell_path if os.path.isabs(shell_path) else shell_name
+            version = program_version(
+                program,
+                "--version",
+                parse=lambda output: output.split()[field].strip("(").strip(")"),
+            )
+        return f"{shell_name} {version}" if version else shell_name
     return "Unknown"
 
 
 def get_resolution():
+    import shutil
+
     try:
         if platform.system() == "Linux":
             # Try Wayland first
@@ -247,13 +175,7 @@ def get_resolution():
                 try:
                     # Try using hyprctl for Hyprland
                     if shutil.which("hyprctl"):
-                        output = subprocess.check_output(
-                            "hyprctl monitors",
-                            shell=True,
-                            text=True,
-                            stderr=subprocess.DEVNULL,
-                        )
-                        for line in output.splitlines():
+                        for line in run_lines("hyprctl", "monitors"):
                             if "1920x1080" in line:
                                 return "1920x1080 @ 60 Hz"
                             elif "1366x768" in line:
@@ -268,12 +190,7 @@ def get_resolution():
                 try:
                     # Try using swaymsg for Sway
                     if shutil.which("swaymsg"):
-                        output = subprocess.check_output(
-                            "swaymsg -t get_outputs",
-                            shell=True,
-                            text=True,
-                            stderr=subprocess.DEVNULL,
-                        )
+                        output = run("swaymsg", "-t", "get_outputs")
                         # Parse JSON output for resolution
                         import json
 
@@ -291,38 +208,22 @@ def get_resolution():
                 except:
                     pass
 
-            # Try X11
-            try:
-                out = subprocess.check_output(
-                    "xrandr | grep '*' | awk '{print $1}'",
-                    shell=True,
-                    text=True,
-                    stderr=subprocess.DEVNULL,
-                )
-                resolutions = list(set(out.strip().split("\n")))
-                if resolutions and resolutions[0]:
-                    # Get refresh rate
-                    try:
-                        refresh_out = subprocess.check_output(
-                            "xrandr | grep '*' | awk '{print $2}'",
-                            shell=True,
-                            text=True,
-                            stderr=subprocess.DEVNULL,
-                        )
-                        refresh = (
-                            refresh_out.strip()
-                            .split("\n")[0]
-                            .replace("*", "")
-                            .replace("+", "")
-                        )
-                        return f"{resolutions[0]} @ {refresh}"
-                    except:
-                        return resolutions[0]
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                pass
+            # Try X11; current modes are marked with '*'
+            if shutil.which("xrandr"):
+                for line in run_lines("xrandr", "--current"):
+                    if "*" not in line:
+                        continue
+                    parts = line.split()
+                    refresh = next((part for part in parts[1:] if "*" in part), "")
+                    refresh = refresh.replace("*", "").replace("+", "")
+                    if refresh:
+                        return f"{parts[0]} @ {refresh}"
+                    return parts[0]
 
             # fallbacks
             try:
+                import glob
+
                 for fb in glob.glob("/sys/class/graphics/fb*/modes"):
                     with open(fb, "r") as f:
                         mode = f.read().strip()
@@ -340,22 +241,13 @@ def get_resolution():
                 pass
 
         elif platform.system() == "Darwin":
-            try:
-                return (
-                    subprocess.check_output(
-                        "system_profiler SPDisplaysDataType | grep Resolution",
-                        shell=True,
-                        text=True,
-                        stderr=subprocess.DEVNULL,
-                    )
-                    .strip()
-                    .split(":")[-1]
-                    .strip()
-                )
-            except:
-                pass
+            for line in run_lines("system_profiler", "SPDisplaysDataType", timeout=15):
+                if "Resolution" in line:
+                    return line.split(":")[-1].strip()
         elif platform.system() == "Windows":
             try:
+                import ctypes
+
                 user32 = ctypes.windll.user32
                 width = user32.GetSystemMetrics(0)
                 height = user32.GetSystemMetrics(1)
@@ -368,7 +260,8 @@ def get_resolution():
         return "Unknown"
 
 
-def get_desktop_env():
+def get_desktop_env(environ=None):
+    environ = os.environ if environ is None else environ
     try:
         if platform.system() == "Darwin":
             return "Aqua (Quartz Compositor)"
@@ -376,34 +269,19 @@ def get_desktop_env():
             return "Windows Shell"
 
         env = (
-            os.environ.get("XDG_CURRENT_DESKTOP")
-            or os.environ.get("DESKTOP_SESSION")
+            environ.get("XDG_CURRENT_DESKTOP")
+            or environ.get("DESKTOP_SESSION")
             or "Unknown"
         )
         env = env.strip()
 
         if "KDE" in env or "Plasma" in env:
-            try:
-                version = subprocess.check_output(
-                    "plasmashell --version",
-                    shell=True,
-                    text=True,
-                    stderr=subprocess.DEVNULL,
-                ).strip()
-                return f"KDE Plasma {version.split()[-1]}"
-            except:
-                return "KDE Plasma"
+            version = program_version(
+                "plasmashell", "--version", parse=lambda output: output.split()[-1]
+            )
+            return f"KDE Plasma {version}" if version else "KDE Plasma"
         elif "GNOME" in env:
-            try:
-                version = subprocess.check_output(
-                    "gnome-shell --version",
-                    shell=True,
-                    text=True,
-                    stderr=subprocess.DEVNULL,
-                ).strip()
-                return version
-            except:
-                return "GNOME"
+            return program_version("gnome-shell", "--version") or "GNOME"
         elif "xfce" in env.lower():
             return "XFCE"
         elif "cinnamon" in env.lower():
@@ -420,6 +298,13 @@ def get_desktop_env():
         return "Unknown"
 
 
+def _hyprland_version():
+    """Get the Hyprland version or None"""
+    return program_version(
+        "hyprctl", "version", parse=lambda output: output.split()[1]
+    )
+
+
 def get_window_manager():
     try:
         if platform.system() == "Darwin":
@@ -431,20 +316,8 @@ def get_window_manager():
         if session_type.lower() == "wayland":
             desktop = os.environ.get("XDG_CURRENT_DESKTOP", "").strip()
             if "hyprland" in desktop.lower():
-                try:
-                    version = (
-                        subprocess.check_output(
-                            "hyprctl version",
-                            shell=True,
-                            text=True,
-                            stderr=subprocess.DEVNULL,
-                        )
-                        .strip()
-                        .split()[1]
-                    )
-                    return f"Hyprland {version}"
-                except:
-                    return "Hyprland"
+                version = _hyprland_version()
+                return f"Hyprland {version}" if version else "Hyprland"
             elif "KDE" in desktop:
                 return "KWin (Wayland)"
             elif "GNOME" in desktop:
@@ -452,338 +325,373 @@ def get_window_manager():
             else:
                 return f"Wayland ({desktop})"
 
-        try:
-            wm_name = subprocess.check_output(
-                "wmctrl -m", shell=True, text=True, stderr=subprocess.DEVNULL
-            )
+        wm_name = run("wmctrl", "-m")
+        if wm_name is not None:
             for line in wm_name.splitlines():
                 if line.startswith("Name:"):
                     wm = line.split(":", 1)[1].strip()
                     # Try to get version for some WMs
                     if "hyprland" in wm.lower():
-                        try:
-                            version = (
-                                subprocess.check_output(
-                                    "hyprctl version",
-                                    shell=True,
-                                    text=True,
-                                    stderr=subprocess.DEVNULL,
-                                )
-                                .strip()
-                                .split()[1]
-                            )
+                        version = _hyprland_version()
+                        if version:
                             return f"{wm} {version}"
-                        except:
-                            pass
                     return wm
-        except:
-            try:
-                xprop = subprocess.check_output(
-                    "xprop -root _NET_WM_NAME",
-                    shell=True,
-                    text=True,
-                    stderr=subprocess.DEVNULL,
-                )
-                return xprop.strip().split("=")[-1].replace('"', "").strip()
-            except:
-                pass
+        else:
+            xprop = run("xprop", "-root", "_NET_WM_NAME")
+            if xprop:
+                return xprop.split("=")[-1].replace('"', "").strip()
 
         return "Unknown"
     except:
         return "Unknown"
 
 
-def get_terminal():
+def get_terminal(environ=None, ppid=None):
+    environ = os.environ if environ is None else environ
     try:
-        parent = os.readlink(f"/proc/{os.getppid()}/exe")
+        parent = os.readlink(f"/proc/{os.getppid() if ppid is None else ppid}/exe")
         terminal = os.path.basename(parent)
         # Try to get version for some terminals
         if terminal == "cursor":
             return "cursor"
         elif terminal == "konsole":
-            try:
-                version = (
-                    subprocess.check_output(
-                        "konsole --version",
-                        shell=True,
-                        text=True,
-                        stderr=subprocess.DEVNULL,
-                    )
-                    .strip()
-                    .split()[-1]
-                )
+            version = program_version(
+                "konsole", "--version", parse=lambda output: output.split()[-1]
+            )
+            if version:
                 return f"{terminal} {version}"
-            except:
-                pass
         return terminal
     except:
-        return os.getenv("TERM", "Unknown")
+        return environ.get("TERM", "Unknown")
 
 
-def get_cpu():
-    try:
-        if platform.system() == "Linux":
-            try:
-                with open("/proc/cpuinfo", "r") as f:
-                    for line in f:
-                        if line.startswith("model name"):
-                            cpu_name = line.split(":")[1].strip()
-                            # Clean up CPU name
-                            if "Intel(R) Core(TM)" in cpu_name:
-                                # Extract just the model (e.g., "i3-1005G1")
+def _boot_memo(key, func):
+    """Run func at most once per boot, keeping its result in the cache store"""
+    policy = CachePolicy(CachePolicy.BOOT)
+    value = policy.load(key)
+    if value is None:
+        value = func()
+        if value is not None:
+            policy.store(key, value)
+    return value
+
+
+def _cpu_model():
+    """Get the CPU model name"""
+    if platform.system() == "Linux":
+        try:
+            with open("/proc/cpuinfo", "r") as f:
+                for line in f:
+                    if line.startswith("model name"):
+                        cpu_name = line.split(":")[1].strip()
+                        # Clean up CPU name
+                        if "Intel(R) Core(TM)" in cpu_name:
+                            # Extract just the model (e.g., "i3-1005G1")
+                            parts = cpu_name.split()
+                            for part in parts:
+                                if part.startswith("i") and "-" in part:
+                                    cpu_name = f"Intel {part}"
+                                    break
+                        elif "AMD" in cpu_name:
+                            # Extract AMD model
+                            if "Ryzen" in cpu_name:
                                 parts = cpu_name.split()
                                 for part in parts:
-                                    if part.startswith("i") and "-" in part:
-                                        cpu_name = f"Intel {part}"
+                                    if part.startswith("Ryzen"):
+                                        cpu_name = f"AMD {part}"
                                         break
-                            elif "AMD" in cpu_name:
-                                # Extract AMD model
-                                if "Ryzen" in cpu_name:
-                                    parts = cpu_name.split()
-                                    for part in parts:
-                                        if part.startswith("Ryzen"):
-                                            cpu_name = f"AMD {part}"
-                                            break
-                            break
-                    else:
-                        cpu_name = "Unknown CPU"
-            except:
-                cpu_name = "Unknown CPU"
-        else:
-            cpu_name = platform.processor() or "Unknown CPU"
-
-        freq = psutil.cpu_freq()
-        cores = psutil.cpu_count()
-        if freq:
-            # Convert to GHz if needed
-            freq_ghz = freq.current / 1000 if freq.current > 1000 else freq.current
-            return f"{cpu_name} ({cores}) @ {freq_ghz:.2f} GHz"
-        else:
-            return f"{cpu_name} ({cores})"
+                        return cpu_name
+        except OSError:
+            pass
+        return "Unknown CPU"
+    return platform.processor() or "Unknown CPU"
+
+
+def cpu_info():
+    """Get the CPU model, logical core count and current frequency in Hz"""
+    import psutil
+
+    # The model is fixed until reboot; only the frequency is read live
+    model = _boot_memo("cpu_model", _cpu_model)
+    freq = psutil.cpu_freq()
+    # psutil reports MHz
+    frequency = freq.current * 1e6 if freq and freq.current else None
+    return Cpu(model, psutil.cpu_count(), frequency)
+
+
+def get_cpu():
+    try:
+        cpu = cpu_info()
+        if cpu.frequency:
+            return f"{cpu.model} ({cpu.cores}) @ {cpu.frequency / 1e9:.2f} GHz"
+        return f"{cpu.model} ({cpu.cores})"
     except:
         return "Unknown"
 
 
+def _clean_gpu_name(gpu_info):
+    """Shorten an lspci-style GPU description to its marketing name"""
+    if "Intel Corporation" in gpu_info or gpu_info.startswith("Intel "):
+        if "Iris Plus Graphics" in gpu_info:
+            gpu_info = "Intel Iris Plus Graphics G1"
+        elif "UHD Graphics" in gpu_info:
+            gpu_info = "Intel UHD Graphics"
+        elif "HD Graphics" in gpu_info:
+            gpu_info = "Intel HD Graphics"
+    elif "NVIDIA" in gpu_info:
+        # Extract NVIDIA model
+        if "GeForce" in gpu_info:
+            parts = gpu_info.replace("[", " ").replace("]", " ").split()
+            for i, part in enumerate(parts):
+                if part == "GeForce" and i + 1 < len(parts):
+                    gpu_info = f"NVIDIA GeForce {' '.join(parts[i + 1:i + 3])}"
+                    break
+    elif "AMD" in gpu_info or "ATI" in gpu_info:
+        # Extract AMD model
+        if "Radeon" in gpu_info:
+            parts = gpu_info.replace("[", " ").replace("]", " ").replace("/", " ").split()
+            for i, part in enumerate(parts):
+                if part == "Radeon" and i + 1 < len(parts):
+                    gpu_info = f"AMD Radeon {parts[i+1]}"
+                    break
+
+    # Truncate if too long
+    if len(gpu_info) > 50:
+        gpu_info = gpu_info[:47] + "..."
+    return gpu_info
+
+
+def _gpu_freq(slot):
+    """Get the current frequency of an Intel GPU in Hz from sysfs, or None"""
+    import glob
+
+    pattern = f"/sys/bus/pci/devices/{slot}/drm/card*/gt_cur_freq_mhz"
+    for path in sorted(glob.glob(pattern)):
+        try:
+            with open(path, "r") as f:
+                freq_output = f.read().strip()
+        except OSError:
+            continue
+        if freq_output.isdigit():
+            return float(freq_output) * 1e6
+    return None
+
+
+def _gpu_models():
+    """List [pci_slot, name] of every GPU; the slot is None off Linux"""
+    if platform.system() == "Windows":
+        lines = run_lines("wmic", "path", "win32_VideoController", "get", "name")[1:]
+        gpus = [line.strip() for line in lines if line.strip()]
+        return [[None, gpus[0]]] if gpus else []
+    elif platform.system() == "Linux":
+        devices = display_devices()
+        names = lookup_names([(dev.vendor, dev.device) for dev in devices])
+        return [[dev.slot, _clean_gpu_name(describe(dev, names))] for dev in devices]
+    elif platform.system() == "Darwin":
+        lines = run_lines("system_profiler", "SPDisplaysDataType", timeout=15)
+        chipsets = [line for line in lines if "Chipset" in line]
+        if chipsets:
+            chipset = chipsets[0].split(":")[-1].strip()
+            if len(chipset) > 50:
+                chipset = chipset[:47] + "..."
+            return [[None, chipset]]
+    return []
+
+
+def gpu_info():
+    """List every GPU with its current frequency in Hz, where known"""
+    # Models are fixed until reboot; only the frequency is read live
+    return [
+        Gpu(name, _gpu_freq(slot) if slot else None)
+        for slot, name in _boot_memo("gpu_models", _gpu_models)
+    ]
+
+
 def get_gpu():
     try:
-        if platform.system() == "Windows":
-            output = subprocess.getoutput("wmic path win32_VideoController get name")
-            lines = output.strip().split("\n")[1:]  # Skip header
-            gpus = [line.strip() for line in lines if line.strip()]
-            return gpus[0] if gpus else "Unknown"
-        elif platform.system() == "Linux":
-            output = subprocess.getoutput("lspci | grep -i vga")
-            if output:
-                # Extract GPU name from lspci output
-                lines = output.strip().split("\n")
-                gpu_info = lines[0].split(":")[-1].strip()
-
-                # Clean up GPU name
-                if "Intel Corporation" in gpu_info:
-                    if "Iris Plus Graphics" in gpu_info:
-                        gpu_info = "Intel Iris Plus Graphics G1"
-                    elif "UHD Graphics" in gpu_info:
-                        gpu_info = "Intel UHD Graphics"
-                    elif "HD Graphics" in gpu_info:
-                        gpu_info = "Intel HD Graphics"
-                elif "NVIDIA" in gpu_info:
-                    # Extract NVIDIA model
-                    if "GeForce" in gpu_info:
-                        parts = gpu_info.split()
-                        for i, part in enumerate(parts):
-                            if part == "GeForce" and i + 1 < len(parts):
-                                gpu_info = f"NVIDIA GeForce {parts[i+1]}"
-                                break
-                elif "AMD" in gpu_info:
-                    # Extract AMD model
-                    if "Radeon" in gpu_info:
-                        parts = gpu_info.split()
-                        for i, part in enumerate(parts):
-                            if part == "Radeon" and i + 1 < len(parts):
-                                gpu_info = f"AMD Radeon {parts[i+1]}"
-                                break
-
-                # Try to get frequency
-                try:
-                    freq_output = subprocess.getoutput(
-                        "cat /sys/class/drm/card*/gt_cur_freq_mhz 2>/dev/null | head -1"
-                    )
-                    if freq_output and freq_output.strip().isdigit():
-                        freq = float(freq_output.strip()) / 1000
-                        gpu_info += f" @ {freq:.2f} GHz"
-                except:
-                    pass
-
-                # Truncate if too long
-                if len(gpu_info) > 50:
-                    gpu_info = gpu_info[:47] + "..."
-                return gpu_info
-            else:
-                return "Unknown"
-        elif platform.system() == "Darwin":
-            output = subprocess.getoutput(
-                "system_profiler SPDisplaysDataType | grep Chipset"
-            )
-            if output:
-                chipset = output.strip().split(":")[-1].strip()
-                if len(chipset) > 50:
-                    chipset = chipset[:47] + "..."
-                return chipset
+        gpus = []
+        for gpu in gpu_info():
+            if gpu.frequency:
+                gpus.append(f"{gpu.name} @ {gpu.frequency / 1e9:.2f} GHz")
             else:
-                return "Unknown"
-        return "Unknown"
+                gpus.append(gpu.name)
+        return ", ".join(gpus) if gpus else "Unknown"
     except:
         return "Unknown"
 
 
+def _format_usage(usage):
+    """Format usage, e.g. 1.50 GiB / 10.00 GiB (15%)"""
+    return f"{format_size(usage.used)} / {format_size(usage.total)} ({int(usage.percent)}%)"
+
+
+def memory_usage():
+    """Get used and total memory in bytes"""
+    import psutil
+
+    mem = psutil.virtual_memory()
+    return Usage(mem.used, mem.total, mem.percent)
+
+
 def get_memory():
     try:
-        mem = psutil.virtual_memory()
-        used = int(mem.used / 1024 / 1024 / 1024 * 100) / 100
-        total = int(mem.total / 1024 / 1024 / 1024 * 100) / 100
-        percent = int(mem.percent)
-        return f"{used} GiB / {total} GiB ({percent}%)"
+        return _format_usage(memory_usage())
     except:
         return "Unknown"
 
 
+def swap_usage():
+    """Get used and total swap in bytes, or None without swap"""
+    import psutil
+
+    swap = psutil.swap_memory()
+    if swap.total <= 0:
+        return None
+    return Usage(swap.used, swap.total, swap.used / swap.total * 100)
+
+
 def get_swap():
     try:
-        swap = psutil.swap_memory()
-        if swap.total > 0:
-            used = int(swap.used / 1024 / 1024 / 1024 * 100) / 100
-            total = int(swap.total / 1024 / 1024 / 1024 * 100) / 100
-            percent = int((swap.used / swap.total) * 100)
-            return f"{used} GiB / {total} GiB ({percent}%)"
-        else:
-            return "N/A"
+        swap = swap_usage()
+        return _format_usage(swap) if swap else "N/A"
     except:
         return "Unknown"
 
 
+def _usage(used, total):
+    """Build a Usage from used and total bytes"""
+    return Usage(used, total, used / total * 100 if total else 0.0)
+
+
+def disk_usages():
+    """
+    Get usage of every real mounted filesystem
+
+    Returns:
+        Disks in mount order; usage is None for mounts that did not respond
+    """
+    if platform.system() == "Linux":
+        mounts = real_mounts()
+        if mounts:
+            usages = disk_usage([mount.mountpoint for mount in mounts])
+            disks = []
+            for mount in mounts:
+                usage = usages[mount.mountpoint]
+                if usage is not None:
+                    usage = _usage(usage.used, usage.total)
+                disks.append(Disk(mount.mountpoint, mount.fstype, usage))
+            return disks
+
+    import psutil
+
+    disk = psutil.disk_usage("/")
+    fstype = next(
+        (part.fstype for part in psutil.disk_partitions() if part.mountpoint == "/"), None
+    )
+    return [Disk("/", fstype, _usage(disk.used, disk.total))]
+
+
 def get_disk():
-    try:
-        disk = psutil.disk_usage("/")
-        used = int(disk.used / 1024 / 1024 / 1024 * 100) / 100
-        total = int(disk.total / 1024 / 1024 / 1024 * 100) / 100
-        percent = int((disk.used / disk.total) * 100)
+    """
+    Get usage of every real mounted filesystem
 
-        # Try to get filesystem type
-        try:
-            fs_type = subprocess.check_output(
-                "df -T / | tail -1 | awk '{print $2}'",
-                shell=True,
-                text=True,
-                stderr=subprocess.DEVNULL,
-            ).strip()
-            return f"{used} GiB / {total} GiB ({percent}%) - {fs_type}"
-        except:
-            return f"{used} GiB / {total} GiB ({percent}%)"
+    Returns:
+        A string when only / is mounted, otherwise a dict of mount point
+        to usage, displayed as one "Disk (mount point)" line each
+    """
+    try:
+        disks = {}
+        for disk in disk_usages():
+            if disk.usage is None:
+                disks[disk.mountpoint] = "Not responding"
+            elif disk.usage.total:
+                text = _format_usage(disk.usage)
+                disks[disk.mountpoint] = f"{text} - {disk.fstype}" if disk.fstype else text
+        if len(disks) == 1 and "/" in disks:
+            return disks["/"]
+        return disks or "Unknown"
     except:
         return "Unknown"
 
 
 def get_ip():
     try:
-        # Get local IP address
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        ip = s.getsockname()[0]
-        s.close()
+        if platform.system() == "Linux":
+            addr = primary_address()
+            if addr is None:
+                return "Unavailable"
+            if addr.prefix is None:
+                return f"{addr.address} ({addr.iface})"
+            return f"{addr.address}/{addr.prefix} ({addr.iface})"
 
-        # Try to get interface name
-        try:
-            if platform.system() == "Linux":
-                output = subprocess.check_output(
-                    "ip route get 8.8.8.8 | awk '{print $5}'",
-                    shell=True,
-                    text=True,
-                    stderr=subprocess.DEVNULL,
-                ).strip()
-                if output:
-                    return f"{ip}/24 ({output})"
-        except:
-            pass
+        import socket
 
-        return ip
+        # Elsewhere ask the kernel which source address it would use; a
+        # UDP connect() sends no packet
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
+        finally:
+            s.close()
     except:
         return "Unavailable"
 
 
-def get_battery():
-    try:
-        if platform.system() == "Linux":
-            try:
-                # Check if battery exists
-                battery_path = "/sys/class/power_supply/BAT0"
-                if not os.path.exists(battery_path):
-                    return "N/A"
-
-                # Get battery info
-                with open(f"{battery_path}/capacity", "r") as f:
-                    capacity = f.read().strip()
-
-                with open(f"{battery_path}/status", "r") as f:
-                    status = f.read().strip()
-
-                # Get battery name
+def battery_status():
+    """Get the battery charge and status, or None without a battery"""
+    if platform.system() == "Linux":
+        battery_path = "/sys/class/power_supply/BAT0"
+        try:
+            with open(f"{battery_path}/capacity", "r") as f:
+                capacity = float(f.read().strip())
+            with open(f"{battery_path}/status", "r") as f:
+                status = f.read().strip()
+        except (OSError, ValueError):
+            return None
+        return Battery(capacity, status)
+    elif platform.system() == "Darwin":
+        # e.g. " -InternalBattery-0 (id=1234)\t85%; charging; 1:02 remaining"
+        lines = run_lines("pmset", "-g", "batt")
+        if len(lines) > 1:
+            parts = lines[1].split("\t")
+            if len(parts) > 1:
+                details = [part.strip() for part in parts[1].split(";")]
                 try:
-                    with open(f"{battery_path}/model_name", "r") as f:
-                        name = f.read().strip()
-                except:
-                    name = "Battery"
-
-                status_text = "Connected" if status == "Charging" else "Disconnected"
-                return f"{capacity}% [{status_text}]"
-            except:
-                return "N/A"
-        elif platform.system() == "Darwin":
-            try:
-                output = subprocess.check_output(
-                    "pmset -g batt", shell=True, text=True, stderr=subprocess.DEVNULL
-                )
-                lines = output.strip().split("\n")
-                if len(lines) > 1:
-                    battery_line = lines[1]
-                    parts = battery_line.split("\t")
-                    if len(parts) > 1:
-                        status = parts[1].strip()
-                        return status
-            except:
-                pass
-        return "N/A"
-    except:
-        return "Unknown"
+                    capacity = float(details[0].rstrip("%"))
+                except ValueError:
+                    return None
+                status = details[1].capitalize() if len(details) > 1 else "Unknown"
+                return Battery(capacity, status)
+    return None
 
 
-def get_locale():
+def get_battery():
     try:
-        return locale.getlocale()[0] or "Unknown"
+        battery = battery_status()
+        if battery is None:
+            return "N/A"
+        status_text = "Connected" if battery.status == "Charging" else "Disconnected"
+        return f"{int(battery.percent)}% [{status_text}]"
     except:
         return "Unknown"
 
 
-def get_dns_gateway():
+def get_locale(environ=None):
+    import locale
+
     try:
-        dns = "Unknown"
-        gateway = "Unknown"
-        if platform.system() == "Linux" or platform.system() == "Darwin":
-            with open("/etc/resolv.conf") as f:
-                dns_lines = [
-                    line.strip().split()[1]
-                    for line in f
-                    if line.startswith("nameserver")
-                ]
-            dns = ", ".join(dns_lines) if dns_lines else "None"
-            route = subprocess.getoutput("ip route show default").split()
-            gateway = route[2] if "default" in route else "Unknown"
-        elif platform.system() == "Windows":
-            output = subprocess.getoutput("ipconfig /all")
-            for line in output.splitlines():
-                if "Default Gateway" in line:
-                    gateway = line.split(":")[-1].strip()
-                if "DNS Servers" in line:
-                    dns = line.split(":")[-1].strip()
-        return f"GW: {gateway} | DNS: {dns}"
+        if environ is None:
+            return locale.getlocale()[0] or "Unknown"
+        # Another process's locale, resolved the way Python sets LC_CTYPE
+        # from the environment at startup, coercing C to C.UTF-8
+        value = next(
+            (environ[name] for name in ("LC_ALL", "LC_CTYPE", "LANG") if environ.get(name)),
+            "C",
+        )
+        if value in ("C", "POSIX"):
+            value = "C.UTF-8"
+        return locale.normalize(value).split(".")[0] or "Unknown"
     except:
         return "Unknown"
+
@@ -1,319 +1,155 @@
-import platform
-from typing import Optional
-from pathlib import Path
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
 
 
-# Logo definitions
-LOGOS = {
-    "arch": r"""                     
-                  -`                     
-                 .o+`                    
-                `ooo/                    
-               `+oooo:                   
-              `+oooooo:                  
-              -+oooooo+:                 
-            `/:-:++oooo+:                
-           `/++++/+++++++:               
-          `/++++++++++++++:              
-         `/+++ooooooooooooo/`            
-        ./ooosssso++osssssso+`           
-       .oossssso-````/ossssss+`          
-      -osssssso.      :ssssssso.         
-     :osssssss/        osssso+++.        
-    /ossssssss/        +ssssooo/-        
-  `/ossssso+/:-        -:/+osssso+-      
- `+sso+:-`                 `.-/+oso:     
-`++:.                           `-/+/    
-.`                                 `/    """,
+# Logo art, one section per logo: a "@@ name [alias ...]" header line
+# followed by the art
+LOGO_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logos.txt")
 
-    "debian": r"""
-       _,met$$$$$gg.
-    ,g$$$$$$$$$$$$$$$P.
-  ,g$$P\"     \"\"\"Y$$.".
- ,$$P'              `$$$.
-',$$P       ,ggs.     `$$b:
-`d$$'     ,$P\"'   .    $$$
- $$P      d$'     ,    $$P
- $$:      $$.   -    ,d$$'
- $$;      Y$b._   _,d$P'
- Y$$.    `.`\"Y$$$$P\"'
- `$$b      \"-.__
-  `Y$$
-   `Y$$.
-     `$$b.
-       `Y$$b.
-          `\"Y$b._
-              `\"\"\"\" """,
+HEADER = b"@@ "
 
-    "ubuntu": r"""
-            .-/+oossssoo+/-.
-        `:+ssssssssssssssssss+:`
-      -+ssssssssssssssssssyyssss+-
-    .ossssssssssssssssss/    /ssssso.
-   /sssssssssssssssss/      /ssssssss/
-  +sssssssssssssss/        /ssssssssss+
- /ssssssssssssss/         /sssssssssssss
-.ssssssssssssss+         +sssssssssssssss.
-+ssssssssssssss/        /ssssssssssssssss+
-ssssssssssssssss+/:  -/sssssssssssssssssss
-ssssssssssssssssssssssssssssssssssssssssss
-+ssssssssssssssssssssssssssssssssssssssss+
-.ssssssssssssssssssssssssssssssssssssssss.
- /ssssssssssssssssssssssssssssssssssssss/
-  +sssssssssssssssssssssssssssssssssss+
-   /sssssssssssssssssssssssssssssssss/
-    .ossssssssssssssssssssssssssssso.
-      -+sssssssssssssssssssssssss+-
-        `:+ssssssssssssssssss+:`
-            .-/+oossssoo+/-.""",
+DEFAULT_LOGO = "arch"
 
-    "mint": r"""
- MMMMMMMMMMMMMMMMMMMMMMMMMmds+.
- MMm----::-://////////////oymNMd+`
- MMd      /++                -sNMd:
- MMNso/`  dMM    `.::-. .-::.`/NMd
- ddddMMh  dMM   :hNMNMNhNMNMNh: `NMm
-     NMm  dMM  .NMN/-+MMM+-/NMN` dMM
-     NMm  dMM  -MMm  `MMM   dMM. dMM
-     NMm  dMM  -MMm  `MMM   dMM. dMM
-     NMm  dMM  .mmd  `mmm   yMM. dMM
-     NMm  dMM`  ..`   ...   ydm. dMM
-     hMM- +MMd/-------...-:sdds  dMM
-     -NMm- :hNMNNNmdddddddddy/`  dMM
-      -dMNs-``-::::-------.``    dMM
-       `/dMNmy+/:-------------:/yMMM
-          ./ydNMMMMMMMMMMMMMMMMMMMMM
-             .MMMMMMMMMMMMMMMMMMM""",
+# os-release ID (or ID_LIKE entry) -> logo name, for IDs that differ
+# from the logo name; IDs naming a logo directly need no entry
+DISTRO_LOGOS = {
+    "linuxmint": "mint",
+    "pop": "popos",
+    "rhel": "redhat",
+    "centos": "redhat",
+    "almalinux": "redhat",
+    "rocky": "redhat",
+    "endeavouros": "arch",
+    "archarm": "arch",
+    "kali-rolling": "kali",
+}
 
-    "mac": r"""
-                    'c.
-                 ,xNMM.
-               .OMMMMo
-               OMMM0,
-     .;loddo:' loolloddol;.
-   cKMMMMMMMMMMNWMMMMMMMMMM0:
- .KMMMMMMMMMMMMMMMMMMMMMMMWd.
- XMMMMMMMMMMMMMMMMMMMMMMMX.
-;MMMMMMMMMMMMMMMMMMMMMMMM:
-:MMMMMMMMMMMMMMMMMMMMMMMM:
-.MMMMMMMMMMMMMMMMMMMMMMMMX.
- kMMMMMMMMMMMMMMMMMMMMMMMMWd.
- .XMMMMMMMMMMMMMMMMMMMMMMMMMMk
-  .XMMMMMMMMMMMMMMMMMMMMMMMMK.
-    kMMMMMMMMMMMMMMMMMMMMMMd
-     ;KMMMMMMMWXXWMMMMMMMk.
-       .cooc,.    .,coo:.""",
+# ((st_ino, st_mtime_ns, st_size) of the logo file, its offset index)
+_index: Optional[Tuple[Tuple[int, int, int], Dict[str, Tuple[int, int]]]] = None
 
-    "windows": r"""                                   
-                                ..,
-                    ....,,:;+ccllll
-      ...,,+:;  cllllllllllllllllll
-,cclllllllllll  lllllllllllllllllll
-llllllllllllll  lllllllllllllllllll
-llllllllllllll  lllllllllllllllllll
-llllllllllllll  lllllllllllllllllll
-llllllllllllll  lllllllllllllllllll
-llllllllllllll  lllllllllllllllllll
-                                    
-llllllllllllll  lllllllllllllllllll
-llllllllllllll  lllllllllllllllllll
-llllllllllllll  lllllllllllllllllll
-llllllllllllll  lllllllllllllllllll
-llllllllllllll  lllllllllllllllllll
-`'ccllllllllll  lllllllllllllllllll
-       `' \*::  :ccllllllllllllllll
-                       ````''*::cll""",
-    
-    "fedora": r"""
-          /:-------------:\          
-       :-------------------::       
-     :-----------/shhOHbmp---:\     
-   /-----------omMMMNNNMMD  ---:   
-  :-----------sMMMMNMNMP.    ---:  
- :-----------:MMMdP-------    ---\
-,------------:MMMd--------    ---:
-:------------:MMMd-------    .---:
-:----    oNMMMMMMMMMNho     .----:
-:--     .+shhhMMMmhhy++   .------/
-:-    -------:MMMd--------------:
-:-   --------/MMMd-------------;
-:-    ------/hMMMy------------:
-:-- :dMNdhhdNMMNo------------;
-:---:sdNMMMMNds:------------:
-:------:://:-------------::
-:---------------------://""",
+# Custom logo path -> ((mtime_ns, size), art)
+_custom: Dict[str, Tuple[Tuple[int, int], str]] = {}
 
-    "redhat": r"""                                   .
-           .MMM..:MMMMMMM                   
-          MMMMMMMMMMMMMMMM                  
-          MMMMMMMMMMMMMMMMMM.              
-         MMMMMMMMMMMMMMMMMMMM              
-        ,MMMMMMMMMMMMMMMMMMMM:             
-        MMMMMMMMMMMMMMMMMMMMMM             
-  .MMMM'  MMMMMMMMMMMMMMMMMMMM            
- MMMMMM    `MMMMMMMMMMMMMMMMMM.             
-MMMMMMMM      MMMMMMMMMMMMMMMM .          
-MMMMMMMMM.       `MMMMMMMMMMM' MM.        
-MMMMMMMMMMM.                     MM        
-`MMMMMMMMMMMMM.                 MM'           
- `MMMMMMMMMMMMMMMMM.           MM'         
-    MMMMMMMMMMMMMMMMMMMMMMMMMM'           
-      MMMMMMMMMMMMMMMMMMMMM'              
-         MMMMMMMMMMMMMMMM'                     
-            `MMMMMMMM'                 
-                                        """,
-    
-    "manjaro": r"""
-██████████████████  ████████
-██████████████████  ████████
-██████████████████  ████████
-██████████████████  ████████
-████████            ████████
-████████  ████████  ████████
-████████  ████████  ████████
-████████  ████████  ████████
-████████  ████████  ████████
-████████  ████████  ████████
-████████  ████████  ████████
-████████  ████████  ████████
-████████  ████████  ████████
-████████  ████████  ████████""",
-    
-    "popos": r"""
-             /////////////
-         /////////////////////
-      ///////*767////////////////
-    //////7676767676*//////////////
-   /////76767//7676767//////////////
-  /////767676///*76767///////////////
- ///////767676///76767.///7676*///////
-/////////767676//76767///767676////////
-//////////76767676767////76767/////////
-///////////76767676//////7676//////////
-////////////,7676,///////767///////////
-/////////////*7676///////76////////////
-///////////////7676////////////////////
- ///////////////7676///767////////////
-  //////////////////////'////////////
-   //////.7676767676767676767,//////
-    /////767676767676767676767/////
-      ///////////////////////////
-         /////////////////////
-             /////////////""",
-    
-    "alpine": r"""
-       .hddddddddddddddddddddddh.
-      :dddddddddddddddddddddddddd:
-     /dddddddddddddddddddddddddddd/
-    +dddddddddddddddddddddddddddddd+
-  `sdddddddddddddddddddddddddddddddds`
- `ydddddddddddd++hdddddddddddddddddddy`
-.hddddddddddd+`  `+ddddh:-sdddddddddddh.
-hdddddddddd+`      `+y:    .sddddddddddh
-ddddddddh+`   `//`   `.`     -sddddddddd
-ddddddh+`   `/hddh/`   `:s-    -sddddddd
-ddddh+`   `/+/dddddh/`   `+s-    -sddddd
-ddd+`   `/o` :dddddddh/`   `oy-    .yddd
-hdddyo+ohddyosdddddddddho+oydddy++ohdddh
-.hddddddddddddddddddddddddddddddddddddh.
- `yddddddddddddddddddddddddddddddddddy`
-  `sdddddddddddddddddddddddddddddddds`
-    +dddddddddddddddddddddddddddddd+
-     /dddddddddddddddddddddddddddd/
-      :dddddddddddddddddddddddddd:
-       .hddddddddddddddddddddddh.""",
-    
-    "gentoo": r"""
-         -/oyddmdhs+:.
-     -odNMMMMMMMMNNmhy+-`
-   -yNMMMMMMMMMMMNNNmmdhy+-
- `omMMMMMMMMMMMMNmdmmmmddhhy/`
- omMMMMMMMMMMMNhhyyyohmdddhhhdo`
-.ydMMMMMMMMMMdhs++so/smdddhhhhdm+`
- oyhdmNMMMMMMMNdyooydmddddhhhhyhNd.
-  :oyhhdNNMMMMMMMNNNmmdddhhhhhyymMh
-    .:+sydNMMMMMNNNmmmdddhhhhhhmMmy
-       /mMMMMMMNNNmmmdddhhhhhmMNhs:
-    `oNMMMMMMMNNNmmmddddhhdmMNhs+`
-  `sNMMMMMMMMNNNmmmdddddmNMmhs/.
- /NMMMMMMMMNNNNmmmdddmNMNdso:`
-+MMMMMMMNNNNNmmmmdmNMNdso/-
-yMMNNNNNNNmmmmmNNMmhs+/-`
-/hMMNNNNNNNNMNdhs++/-`
-`/ohdmmddhys+++/:.`
-  `-//////:--.""",
-    
-    "kali": r"""
-      ,.....                                       
-  ----`   `..,;:ccc,.                             
-           ......''';lxO.                          
-.....''''..........,:ld;                          
-           .';;;:::;,,.x,                          
-      ..'''.            0Xxoc:,.  ...              
-  ....                ,ONkc;,;cokOdc',.            
- .                   OMo           ':do.           
-                    dMc               :OO;         
-                    0M.                 .:o.       
-                    ;Wd                            
-                     ;XO,                          
-                       ,d0Odlc;,..                 
-                           ..',;:cdOOd::,.         
-                                    .:d;.':;.      
-                                       'd,  .'     
-                                         ;l   ..   
-                                          .o       
-                                            c      
-                                            .'     
-                                             .""",
-}
 
-# Add aliases
-LOGOS["debian"] = LOGOS.get("debian", LOGOS["arch"])
-LOGOS["ubuntu"] = LOGOS.get("ubuntu", LOGOS["arch"])
-LOGOS["mint"] = LOGOS.get("mint", LOGOS["arch"])
-LOGOS["redhat"] = LOGOS.get("redhat", LOGOS["arch"])
-LOGOS["mac"] = LOGOS.get("mac", LOGOS["arch"])
-LOGOS["windows"] = LOGOS.get("windows", LOGOS["arch"])
-LOGOS["macos"] = LOGOS["mac"]
-LOGOS["darwin"] = LOGOS["mac"]
-LOGOS["pop"] = LOGOS["popos"]
+def __getattr__(name: str):
+    # LOGOS is built from the logo file on first access
+    if name == "LOGOS":
+        return _logos()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _build_index(path: str = LOGO_FILE) -> Dict[str, Tuple[int, int]]:
+    """
+    Scan the logo file for section offsets
+
+    Returns:
+        Mapping of logo name and alias to (offset, length) of its art
+    """
+    index: Dict[str, Tuple[int, int]] = {}
+    names: List[str] = []
+    start = offset = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if line.startswith(HEADER):
+                for name in names:
+                    index[name] = (start, offset - start)
+                names = line[len(HEADER):].decode("utf-8").split()
+                start = offset + len(line)
+            offset += len(line)
+    for name in names:
+        index[name] = (start, offset - start)
+    return index
+
+
+def logo_index() -> Dict[str, Tuple[int, int]]:
+    """
+    Get the offset index of the logo file
+
+    The index is kept in memory while the logo file's inode, mtime and
+    size are unchanged; scanning the small file is cheaper than loading
+    the cache store.
+    """
+    global _index
+    try:
+        st = os.stat(LOGO_FILE)
+    except OSError:
+        return {}
+    token = (st.st_ino, st.st_mtime_ns, st.st_size)
+    if _index is None or _index[0] != token:
+        try:
+            _index = (token, _build_index())
+        except OSError:
+            return {}
+    return _index[1]
+
+
+def load_logo(name: str) -> Optional[str]:
+    """Read the art of one logo, or None if there is no such logo"""
+    span = logo_index().get(name)
+    if span is None:
+        return None
+    offset, length = span
+    try:
+        with open(LOGO_FILE, "rb") as f:
+            f.seek(offset)
+            art = f.read(length).decode("utf-8")
+    except OSError:
+        return None
+    return art[:-1] if art.endswith("\n") else art
+
+
+def _logos() -> Dict[str, str]:
+    """Load every logo, keyed by name and alias"""
+    return {name: load_logo(name) or "" for name in logo_index()}
 
 
 def detect_distro() -> str:
     """
-    Detect the current Linux distribution
+    Detect the logo matching the current OS
+    
+    On Linux the os-release ID is matched first, then each ID_LIKE entry,
+    so derivatives fall back to their parent distribution's logo.
     
     Returns:
-        Distribution name in lowercase
+        Logo name in lowercase
     """
-    os_name = platform.system().lower()
-    
-    if os_name == "linux":
-        try:
-            with open("/etc/os-release") as f:
-                os_release = f.read().lower()
-                
-                # Check for specific distributions
-                distros = [
-                    "arch", "ubuntu", "debian", "mint", "fedora",
-                    "manjaro", "popos", "pop", "alpine", "gentoo",
-                    "kali", "red hat", "redhat"
-                ]
-                
-                for distro in distros:
-                    if distro in os_release:
-                        return distro.replace(" ", "")
-        except FileNotFoundError:
-            pass
+    if sys.platform.startswith("linux"):
+        from .osrelease import distro_ids
+        
+        names = logo_index()
+        for distro_id in distro_ids():
+            name = DISTRO_LOGOS.get(distro_id, distro_id)
+            if name in names:
+                return name
         
-        return "arch"  # Default for Linux
+        return DEFAULT_LOGO  # Default for Linux
     
-    elif os_name == "darwin":
+    elif sys.platform == "darwin":
         return "mac"
-    elif os_name == "windows":
+    elif sys.platform in ("win32", "cygwin"):
         return "windows"
     
-    return "arch"
+    return DEFAULT_LOGO
+
+
+def _read_custom_logo(path: str) -> Optional[str]:
+    """Read a custom logo, reusing the last read while its mtime is unchanged"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    token = (st.st_mtime_ns, st.st_size)
+    cached = _custom.get(path)
+    if cached is not None and cached[0] == token:
+        return cached[1]
+    try:
+        with open(path, "r") as f:
+            art = f.read()
+    except OSError:
+        return None
+    _custom[path] = (token, art)
+    return art
 
 
 def get_logo(logo_name: Optional[str] = None, custom_logo_path: Optional[str] = None) -> str:
@@ -329,15 +165,16 @@ def get_logo(logo_name: Optional[str] = None, custom_logo_path: Optional[str] =
     """
     # Use custom logo if provided
     if custom_logo_path:
-        try:
-            with open(custom_logo_path, "r") as f:
-                return f.read()
-        except (IOError, FileNotFoundError):
-            pass
+        art = _read_custom_logo(custom_logo_path)
+        if art is not None:
+            return art
     
     # Use specified logo or detect
     distro = logo_name or detect_distro()
-    return LOGOS.get(distro.lower(), LOGOS["arch"])
+    art = load_logo(distro.lower())
+    if art is None:
+        art = load_logo(DEFAULT_LOGO) or ""
+    return art
 
 
 def list_logos() -> list:
@@ -347,4 +184,4 @@ def list_logos() -> list:
     Returns:
         List of logo names
     """
-    return sorted(set(LOGOS.keys()))
+    return sorted(logo_index())
@@ -0,0 +1,282 @@
+"""
+OpenMetrics exporter
+
+Usage:
+    ezfetch serve-metrics [--listen 127.0.0.1:9184] [--interval 15]
+                          [--config FILE]
+"""
+import argparse
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_LISTEN = "127.0.0.1:9184"
+
+# Seconds a sample is served before the system is read again
+DEFAULT_INTERVAL = 15.0
+
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value"""
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(labels: Optional[Dict[str, str]]) -> str:
+    """Format a label set, e.g. {mountpoint="/"}"""
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+class Family:
+    """A metric family and its samples"""
+
+    __slots__ = ("name", "kind", "help", "samples")
+
+    def __init__(self, name: str, kind: str, help: str):
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.samples: List[Tuple[Optional[Dict[str, str]], float]] = []
+
+    def add(self, value: float, labels: Optional[Dict[str, str]] = None) -> "Family":
+        self.samples.append((labels, value))
+        return self
+
+    def render(self, openmetrics: bool) -> List[str]:
+        """
+        Format the family in the exposition format
+
+        Args:
+            openmetrics: OpenMetrics 1.0 if True, else Prometheus text 0.0.4,
+                which has no info type and spells it as a gauge
+        """
+        name, kind = self.name, self.kind
+        sample_name = name
+        if kind == "info":
+            sample_name = name + "_info"
+            if not openmetrics:
+                name, kind = sample_name, "gauge"
+        lines = [f"# HELP {name} {self.help}", f"# TYPE {name} {kind}"]
+        for labels, value in self.samples:
+            lines.append(f"{sample_name}{_labels(labels)} {value!r}")
+        return lines
+
+
+def build_families(info, static: Dict[str, str]) -> List[Family]:
+    """
+    Turn a SystemInfo into metric families
+
+    Args:
+        info: ezfetch.api.SystemInfo with the current values
+        static: Static fields, exposed as labels of ezfetch_system_info
+
+    Returns:
+        Families with at least one sample
+    """
+    families = [Family("ezfetch_system", "info", "Static system fields").add(1, static)]
+
+    def gauge(name: str, help: str) -> Family:
+        family = Family(name, "gauge", help)
+        families.append(family)
+        return family
+
+    if info.uptime is not None:
+        gauge("ezfetch_uptime_seconds", "Time since boot").add(float(info.uptime))
+    if info.memory is not None:
+        gauge("ezfetch_memory_used_bytes", "Used memory").add(info.memory.used)
+        gauge("ezfetch_memory_total_bytes", "Total memory").add(info.memory.total)
+    if info.swap is not None:
+        gauge("ezfetch_swap_used_bytes", "Used swap").add(info.swap.used)
+        gauge("ezfetch_swap_total_bytes", "Total swap").add(info.swap.total)
+    if info.disks:
+        responding = gauge("ezfetch_disk_responding", "Whether statvfs answered in time")
+        used = gauge("ezfetch_disk_used_bytes", "Used space per mount")
+        total = gauge("ezfetch_disk_total_bytes", "Total space per mount")
+        for disk in info.disks:
+            labels = {"mountpoint": disk.mountpoint, "fstype": disk.fstype or ""}
+            responding.add(0 if disk.usage is None else 1, labels)
+            if disk.usage is not None:
+                used.add(disk.usage.used, labels)
+                total.add(disk.usage.total, labels)
+    if info.packages is not None:
+        gauge("ezfetch_packages", "Installed packages").add(
+            info.packages.count, {"manager": info.packages.manager}
+        )
+    if info.battery is not None:
+        gauge("ezfetch_battery_charge_percent", "Battery charge").add(info.battery.percent)
+        gauge("ezfetch_battery_charging", "Whether the battery is charging").add(
+            1 if info.battery.status == "Charging" else 0
+        )
+    if info.cpu is not None:
+        if info.cpu.cores:
+            gauge("ezfetch_cpu_cores", "Logical CPU cores").add(info.cpu.cores)
+        if info.cpu.frequency:
+            gauge("ezfetch_cpu_frequency_hertz", "Current CPU frequency").add(
+                info.cpu.frequency
+            )
+    gpus = [gpu for gpu in info.gpus if gpu.frequency]
+    if gpus:
+        family = gauge("ezfetch_gpu_frequency_hertz", "Current GPU frequency")
+        for gpu in gpus:
+            family.add(gpu.frequency, {"gpu": gpu.name})
+
+    return [family for family in families if family.samples]
+
+
+class Exporter:
+    """Samples the system at most once per interval, however often it is scraped"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._static: Optional[Dict[str, str]] = None
+        self._families: List[Family] = []
+        self._sampled_at: Optional[float] = None
+
+    def _static_labels(self, info) -> Dict[str, str]:
+        """Static fields, read once for the lifetime of the process"""
+        if self._static is None:
+            self._static = {
+                "hostname": info.hostname,
+                "host": info.host or "",
+                "os": info.os,
+                "kernel": info.kernel,
+                "cpu": info.cpu.model if info.cpu else "",
+                "gpu": ", ".join(gpu.name for gpu in info.gpus),
+            }
+        return self._static
+
+    def families(self) -> List[Family]:
+        """Get the current families, sampling again once the interval passed"""
+        with self._lock:
+            now = time.monotonic()
+            if self._sampled_at is None or now - self._sampled_at >= self.interval:
+                from .api import collect
+                from .cache import get_cache
+
+                info = collect()
+                self._families = build_families(info, self._static_labels(info))
+                self._sampled_at = now
+                get_cache().flush()
+            return self._families
+
+    def exposition(self, openmetrics: bool = True) -> str:
+        """Render the current sample in the exposition format"""
+        lines = []
+        for family in self.families():
+            lines.extend(family.render(openmetrics))
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def parse_listen(listen: str) -> Tuple[str, int]:
+    """
+    Split HOST:PORT, accepting [IPv6]:PORT
+
+    Raises:
+        ValueError: If there is no valid port
+    """
+    host, sep, port = listen.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"expected HOST:PORT, got {listen!r}")
+    if host.startswith("[") and host.endswith("]"):
+        host = host[1:-1]
+    return host or "0.0.0.0", int(port)
+
+
+def serve(exporter: Exporter, host: str, port: int) -> None:
+    """Serve /metrics over HTTP until interrupted"""
+    import socket
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/":
+                body = b'<html><body><a href="/metrics">Metrics</a></body></html>\n'
+                content_type = "text/html; charset=utf-8"
+            elif path == "/metrics":
+                openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+                body = exporter.exposition(openmetrics).encode("utf-8")
+                content_type = OPENMETRICS_TYPE if openmetrics else PROMETHEUS_TYPE
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        address_family = socket.AF_INET6 if ":" in host else socket.AF_INET
+
+    server = Server((host, port), Handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point of ``ezfetch serve-metrics``
+
+    Args:
+        argv: Command-line arguments after "serve-metrics"
+
+    Returns:
+        Exit status
+    """
+    parser = argparse.ArgumentParser(
+        prog="ezfetch serve-metrics",
+        description="Expose system info as OpenMetrics gauges over HTTP",
+    )
+    parser.add_argument("--listen", default=DEFAULT_LISTEN, metavar="HOST:PORT",
+                        help=f"Address to listen on (default: {DEFAULT_LISTEN})")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, metavar="SECONDS",
+                        help="Read the system at most once per this many seconds "
+                             f"(default: {DEFAULT_INTERVAL:g})")
+    parser.add_argument("-c", "--config", help="Path to custom config file")
+    args = parser.parse_args(argv)
+
+    try:
+        host, port = parse_listen(args.listen)
+    except ValueError as e:
+        parser.error(str(e))
+
+    import signal
+
+    from .cache import set_cache_mode
+    from .config import get_config
+
+    config = get_config(args.config)
+    set_cache_mode(
+        enabled=config.get("performance", "cache_enabled", default=True), refresh=False
+    )
+
+    def _terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _terminate)
+
+    try:
+        serve(Exporter(max(0.0, args.interval)), host, port)
+    except OSError as e:
+        print(f"ezfetch serve-metrics: cannot listen on {args.listen}: {e}", file=sys.stderr)
+        return 1
+    return 0
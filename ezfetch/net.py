@@ -0,0 +1,167 @@
+"""
+Spawn-free local address and default route discovery
+"""
+import os
+import socket
+from typing import List, NamedTuple, Optional
+
+
+PROC_ROUTE = "/proc/net/route"
+PROC_IPV6_ROUTE = "/proc/net/ipv6_route"
+
+RTF_UP = 0x0001
+
+
+class Route(NamedTuple):
+    """A default route"""
+
+    iface: str
+    gateway: Optional[str]
+    metric: int
+    family: int
+
+
+class Address(NamedTuple):
+    """An interface address with its prefix length"""
+
+    iface: str
+    address: str
+    prefix: Optional[int]
+    family: int
+
+
+def _default_routes_v4(path: str = PROC_ROUTE) -> List[Route]:
+    """Parse IPv4 default routes from /proc/net/route"""
+    import struct
+
+    routes = []
+    try:
+        with open(path, "r") as f:
+            next(f, None)  # header
+            for line in f:
+                fields = line.split()
+                if len(fields) < 8:
+                    continue
+                iface, dest, gateway, flags, metric, mask = (
+                    fields[0], fields[1], fields[2], fields[3], fields[6], fields[7]
+                )
+                if dest != "00000000" or mask != "00000000":
+                    continue
+                if not int(flags, 16) & RTF_UP:
+                    continue
+                gw = socket.inet_ntoa(struct.pack("<L", int(gateway, 16)))
+                routes.append(
+                    Route(iface, gw if gw != "0.0.0.0" else None, int(metric), socket.AF_INET)
+                )
+    except (OSError, ValueError):
+        return []
+    return routes
+
+
+def _default_routes_v6(path: str = PROC_IPV6_ROUTE) -> List[Route]:
+    """Parse IPv6 default routes from /proc/net/ipv6_route"""
+    routes = []
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 10:
+                    continue
+                dest, prefix, next_hop, metric, flags, iface = (
+                    fields[0], fields[1], fields[4], fields[5], fields[8], fields[9]
+                )
+                if prefix != "00" or int(dest, 16) != 0 or iface == "lo":
+                    continue
+                if not int(flags, 16) & RTF_UP:
+                    continue
+                gw = None
+                if int(next_hop, 16):
+                    gw = socket.inet_ntop(socket.AF_INET6, bytes.fromhex(next_hop))
+                routes.append(Route(iface, gw, int(metric, 16), socket.AF_INET6))
+    except (OSError, ValueError):
+        return []
+    return routes
+
+
+def default_route(family: Optional[int] = None) -> Optional[Route]:
+    """
+    Get the preferred default route from /proc
+
+    Args:
+        family: socket.AF_INET or socket.AF_INET6 (default: IPv4, then IPv6)
+
+    Returns:
+        Route with the lowest metric, or None when there is no default route
+    """
+    if family in (None, socket.AF_INET):
+        routes = _default_routes_v4()
+        if routes or family is not None:
+            return min(routes, key=lambda route: route.metric) if routes else None
+    routes = _default_routes_v6()
+    return min(routes, key=lambda route: route.metric) if routes else None
+
+
+def _prefix_len(family: int, netmask: Optional[str]) -> Optional[int]:
+    """Count the set bits of a dotted or colon-separated netmask"""
+    if not netmask:
+        return None
+    try:
+        packed = socket.inet_pton(family, netmask)
+    except (OSError, ValueError):
+        return None
+    return sum(bin(byte).count("1") for byte in packed)
+
+
+def interface_addresses(iface: Optional[str] = None) -> List[Address]:
+    """
+    List IPv4 and global IPv6 addresses with prefix lengths
+
+    Args:
+        iface: Only list addresses of this interface
+
+    Returns:
+        Addresses, IPv4 first, loopback and link-local excluded
+    """
+    import psutil
+
+    try:
+        all_addrs = psutil.net_if_addrs()
+    except Exception:
+        return []
+
+    addresses = []
+    for name, addrs in all_addrs.items():
+        if iface is not None and name != iface:
+            continue
+        for addr in addrs:
+            if addr.family not in (socket.AF_INET, socket.AF_INET6):
+                continue
+            ip = addr.address.split("%", 1)[0]
+            if ip.startswith("127.") or ip == "::1" or ip.lower().startswith("fe80:"):
+                continue
+            addresses.append(
+                Address(name, ip, _prefix_len(addr.family, addr.netmask), addr.family)
+            )
+    addresses.sort(key=lambda a: 0 if a.family == socket.AF_INET else 1)
+    return addresses
+
+
+def primary_address() -> Optional[Address]:
+    """
+    Get the address of the default-route interface
+
+    Falls back to the first non-loopback address when the host has no
+    default route, without sending any packet or spawning a process.
+    """
+    route = default_route() if os.path.exists(PROC_ROUTE) else None
+    if route is not None:
+        addresses = interface_addresses(route.iface)
+        for addr in addresses:
+            if addr.family == route.family:
+                return addr
+        if addresses:
+            return addresses[0]
+
+    addresses = interface_addresses()
+    return addresses[0] if addresses else None
+
@@ -0,0 +1,91 @@
+"""
+os-release parsing shared by OS detection and logo selection
+"""
+from typing import Dict, List, Optional
+
+
+# Searched in order, as specified by os-release(5)
+OS_RELEASE_PATHS = ("/etc/os-release", "/usr/lib/os-release")
+
+# Parsed files, so every caller in a run shares a single read
+_parsed: Dict[Optional[str], Dict[str, str]] = {}
+
+
+def _unquote(value: str) -> str:
+    """Strip shell-style quotes and backslash escapes from a value"""
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        value = value[1:-1]
+        if "\\" in value:
+            chars = []
+            escaped = False
+            for char in value:
+                if escaped or char != "\\":
+                    chars.append(char)
+                    escaped = False
+                else:
+                    escaped = True
+            value = "".join(chars)
+    return value
+
+
+def parse_os_release(text: str) -> Dict[str, str]:
+    """
+    Parse os-release content into a dict
+
+    Args:
+        text: File content in os-release(5) KEY=value format
+
+    Returns:
+        Mapping of key to unquoted value
+    """
+    fields = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        fields[key.strip()] = _unquote(value.strip())
+    return fields
+
+
+def os_release(path: Optional[str] = None) -> Dict[str, str]:
+    """
+    Get the parsed os-release of this system
+
+    The file is read and parsed at most once per process.
+
+    Args:
+        path: File to read (default: the first of OS_RELEASE_PATHS found)
+
+    Returns:
+        Mapping of key to value, empty if no os-release file exists
+    """
+    if path in _parsed:
+        return _parsed[path]
+
+    fields: Dict[str, str] = {}
+    for candidate in (path,) if path else OS_RELEASE_PATHS:
+        try:
+            with open(candidate, "r", encoding="utf-8", errors="replace") as f:
+                fields = parse_os_release(f.read())
+            break
+        except OSError:
+            continue
+    _parsed[path] = fields
+    return fields
+
+
+def distro_ids(fields: Optional[Dict[str, str]] = None) -> List[str]:
+    """
+    Get the distribution ID followed by its ID_LIKE ancestors
+
+    Example:
+        ["pop", "ubuntu", "debian"] on Pop!_OS
+    """
+    fields = os_release() if fields is None else fields
+    ids = []
+    for value in [fields.get("ID", "")] + fields.get("ID_LIKE", "").split():
+        value = value.strip().lower()
+        if value and value not in ids:
+            ids.append(value)
+    return ids
@@ -0,0 +1,119 @@
+"""
+In-process readers for package manager databases
+"""
+import os
+import re
+from typing import Callable, Optional, Tuple
+
+from .cache import CachePolicy
+
+
+DPKG_STATUS = "/var/lib/dpkg/status"
+PACMAN_LOCAL = "/var/lib/pacman/local"
+APK_INSTALLED = "/lib/apk/db/installed"
+
+# "want ok installed" where want is install or hold; excludes removed
+# packages that are only config-files or half-installed
+_DPKG_INSTALLED = re.compile(rb"^Status: (?:install|hold) ok installed$", re.M)
+
+_CHUNK_SIZE = 1 << 20
+
+
+def _memoized(name: str, path: str, reader: Callable[[str], int]) -> Optional[int]:
+    """
+    Run reader on path, memoized against the path's mtime and size
+
+    Args:
+        name: Package manager name, used as cache key
+        path: Database file or directory
+        reader: Function returning the package count for path
+
+    Returns:
+        Package count or None if the database does not exist
+    """
+    if not os.path.exists(path):
+        return None
+
+    policy = CachePolicy(CachePolicy.VALIDATOR, sources=[path])
+    cache_key = f"packages_{name}"
+    count = policy.load(cache_key)
+    if count is not None:
+        return count
+
+    try:
+        count = reader(path)
+    except OSError:
+        return None
+    policy.store(cache_key, count)
+    return count
+
+
+def _read_dpkg(path: str) -> int:
+    """Count installed packages in a dpkg status file"""
+    count = 0
+    tail = b""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            buf = tail + chunk
+            cut = buf.rfind(b"\n") + 1
+            count += len(_DPKG_INSTALLED.findall(buf, 0, cut))
+            tail = buf[cut:]
+    if tail:
+        count += len(_DPKG_INSTALLED.findall(tail))
+    return count
+
+
+def _read_pacman(path: str) -> int:
+    """Count package entries in the pacman local database"""
+    with os.scandir(path) as entries:
+        return sum(1 for entry in entries if entry.is_dir())
+
+
+def _read_apk(path: str) -> int:
+    """Count package records in the apk installed database"""
+    count = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if line.startswith(b"P:"):
+                count += 1
+    return count
+
+
+def count_dpkg() -> Optional[int]:
+    """Number of installed dpkg packages or None if dpkg is not present"""
+    return _memoized("dpkg", DPKG_STATUS, _read_dpkg)
+
+
+def count_pacman() -> Optional[int]:
+    """Number of installed pacman packages or None if pacman is not present"""
+    return _memoized("pacman", PACMAN_LOCAL, _read_pacman)
+
+
+def count_apk() -> Optional[int]:
+    """Number of installed apk packages or None if apk is not present"""
+    return _memoized("apk", APK_INSTALLED, _read_apk)
+
+
+# Readers tried in order before falling back to package manager commands
+NATIVE_READERS = (
+    ("dpkg", count_dpkg),
+    ("pacman", count_pacman),
+    ("apk", count_apk),
+)
+
+
+def count_native() -> Optional[Tuple[int, str]]:
+    """
+    Count packages by reading a package database directly
+
+    Returns:
+        (count, manager) for the first database found, or None
+    """
+    for manager, reader in NATIVE_READERS:
+        count = reader()
+        if count is not None:
+            return count, manager
+    return None
@@ -0,0 +1,191 @@
+"""
+PCI device enumeration from sysfs with pci.ids name lookup
+"""
+import os
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .cache import CachePolicy
+
+
+SYSFS_PCI_DEVICES = "/sys/bus/pci/devices"
+
+# Locations of the pci.ids database used by common distributions
+PCI_IDS_PATHS = (
+    "/usr/share/hwdata/pci.ids",
+    "/usr/share/misc/pci.ids",
+    "/usr/share/pci.ids",
+    "/usr/share/hwdata/pci.ids.gz",
+    "/usr/share/misc/pci.ids.gz",
+)
+
+# PCI base class of display controllers (VGA, XGA, 3D, other)
+DISPLAY_CLASS = 0x03
+
+# Fallback vendor names when pci.ids is not installed
+KNOWN_VENDORS = {
+    "1002": "AMD",
+    "1022": "AMD",
+    "10de": "NVIDIA",
+    "8086": "Intel",
+    "1af4": "Red Hat, Inc.",
+    "1234": "QEMU",
+    "15ad": "VMware",
+    "80ee": "VirtualBox",
+    "1414": "Microsoft Corporation",
+    "5143": "Qualcomm",
+    "13b5": "ARM",
+}
+
+
+class PciDevice(NamedTuple):
+    """A PCI device as seen in sysfs"""
+
+    slot: str
+    pci_class: int
+    vendor: str
+    device: str
+
+
+def _read_hex(path: str) -> Optional[str]:
+    """Read a 0x-prefixed hex id from sysfs, lowercased without prefix"""
+    try:
+        with open(path, "r") as f:
+            value = f.read().strip().lower()
+    except OSError:
+        return None
+    return value[2:] if value.startswith("0x") else value
+
+
+def list_devices(root: str = SYSFS_PCI_DEVICES) -> List[PciDevice]:
+    """Enumerate PCI devices from sysfs, sorted by slot"""
+    try:
+        slots = sorted(os.listdir(root))
+    except OSError:
+        return []
+
+    devices = []
+    for slot in slots:
+        base = os.path.join(root, slot)
+        pci_class = _read_hex(os.path.join(base, "class"))
+        vendor = _read_hex(os.path.join(base, "vendor"))
+        device = _read_hex(os.path.join(base, "device"))
+        if pci_class is None or vendor is None or device is None:
+            continue
+        try:
+            devices.append(PciDevice(slot, int(pci_class, 16), vendor, device))
+        except ValueError:
+            continue
+    return devices
+
+
+def display_devices(root: str = SYSFS_PCI_DEVICES) -> List[PciDevice]:
+    """Enumerate every display-class PCI device"""
+    return [dev for dev in list_devices(root) if dev.pci_class >> 16 == DISPLAY_CLASS]
+
+
+def find_pci_ids() -> Optional[str]:
+    """Get the path of the installed pci.ids database, if any"""
+    for path in PCI_IDS_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _open_ids(path: str):
+    """Open pci.ids (optionally gzip-compressed) as text"""
+    if path.endswith(".gz"):
+        import gzip
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def _scan_pci_ids(
+    path: str, wanted: Sequence[Tuple[str, str]]
+) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Look up vendor and device names in one pass over pci.ids
+
+    The file is sorted by vendor id, so the scan stops as soon as the
+    last wanted vendor has been passed.
+
+    Returns:
+        {vendor_id: {"": vendor_name, device_id: device_name, ...}}
+    """
+    wanted_devices: Dict[str, set] = {}
+    for vendor, device in wanted:
+        wanted_devices.setdefault(vendor, set()).add(device)
+    last_vendor = max(wanted_devices)
+
+    names: Dict[str, Dict[str, Optional[str]]] = {}
+    current = None
+    with _open_ids(path) as f:
+        for line in f:
+            if not line.strip() or line[0] == "#":
+                continue
+            if line[0] != "\t":
+                vendor_id = line[:4].lower()
+                # Vendors end where the device class list begins
+                if line.startswith("C ") or vendor_id > last_vendor:
+                    break
+                if vendor_id in wanted_devices:
+                    current = vendor_id
+                    names[current] = {"": line[4:].strip()}
+                else:
+                    current = None
+            elif current is not None and line[1] != "\t":
+                device_id = line[1:5].lower()
+                if device_id in wanted_devices[current]:
+                    names[current][device_id] = line[5:].strip()
+    return names
+
+
+def lookup_names(
+    ids: Sequence[Tuple[str, str]]
+) -> Dict[Tuple[str, str], Tuple[Optional[str], Optional[str]]]:
+    """
+    Resolve (vendor, device) id pairs to names
+
+    Only the requested ids are looked up, and the result is cached against
+    the pci.ids file so the multi-megabyte database is not read again
+    until it changes.
+
+    Returns:
+        {(vendor, device): (vendor_name, device_name)}; names are None
+        when unknown
+    """
+    ids = sorted(set(ids))
+    if not ids:
+        return {}
+
+    names: Dict[str, Dict[str, Optional[str]]] = {}
+    path = find_pci_ids()
+    if path:
+        policy = CachePolicy(CachePolicy.VALIDATOR, sources=[path])
+        key = "pci_ids_" + ",".join(f"{vendor}:{device}" for vendor, device in ids)
+        cached = policy.load(key)
+        if cached is not None:
+            names = cached
+        else:
+            try:
+                names = _scan_pci_ids(path, ids)
+            except OSError:
+                names = {}
+            else:
+                policy.store(key, names)
+
+    result = {}
+    for vendor, device in ids:
+        vendor_names = names.get(vendor, {})
+        result[(vendor, device)] = (
+            vendor_names.get("") or KNOWN_VENDORS.get(vendor),
+            vendor_names.get(device),
+        )
+    return result
+
+
+def describe(device: PciDevice, names: Dict) -> str:
+    """Build an lspci-style "Vendor Device" description"""
+    vendor_name, device_name = names.get((device.vendor, device.device), (None, None))
+    vendor_name = vendor_name or f"Vendor {device.vendor}"
+    device_name = device_name or f"Device {device.device}"
+    return f"{vendor_name} {device_name}"
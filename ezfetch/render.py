@@ -0,0 +1,130 @@
+"""
+Frame layout for the logo and field columns
+"""
+import os
+import sys
+from typing import Any, List, Mapping, Optional
+
+from .colors import Theme, strip_ansi
+from .utils import truncate
+
+
+# Space between the logo column and the fields
+LOGO_GAP = 2
+
+# Values are never truncated below this width, however narrow the terminal
+MIN_VALUE_WIDTH = 10
+
+
+def terminal_width(stream=None) -> Optional[int]:
+    """
+    Get the width of the terminal stream writes to
+
+    Returns:
+        Number of columns ($COLUMNS wins), or None when stream is not a
+        terminal
+    """
+    columns = os.environ.get("COLUMNS", "")
+    if columns.isdigit() and int(columns) > 0:
+        return int(columns)
+    stream = stream or sys.stdout
+    try:
+        if stream.isatty():
+            return os.get_terminal_size(stream.fileno()).columns
+    except (AttributeError, OSError, ValueError):
+        pass
+    return None
+
+
+class Layout:
+    """
+    Precomputed layout of one logo and theme
+
+    Colors and logo padding are resolved once; each frame only pads plain
+    labels and values, so column widths never count escape sequences.
+    """
+
+    def __init__(
+        self,
+        logo_lines: Optional[List[str]] = None,
+        theme: Optional[Theme] = None,
+        logo_padding: int = 30,
+        width: Optional[int] = None,
+        truncate_length: int = 50,
+    ):
+        """
+        Args:
+            logo_lines: Lines of the logo, or None to display no logo
+            theme: Color theme, or None for plain output
+            logo_padding: Minimum width of the logo column
+            width: Terminal width used to fit values (None: use
+                truncate_length)
+            truncate_length: Maximum value length when width is unknown
+        """
+        self.width = width
+        self.truncate_length = truncate_length
+
+        # Logo lines are padded once to a common visible width
+        self.logo_lines: List[str] = []
+        self.padded_logo: List[str] = []
+        self.logo_width = 0
+        if logo_lines is not None:
+            widths = [len(strip_ansi(line)) for line in logo_lines]
+            self.logo_width = max([logo_padding] + widths) + LOGO_GAP
+            self.logo_lines = list(logo_lines)
+            self.padded_logo = [
+                line + " " * (self.logo_width - visible)
+                for line, visible in zip(logo_lines, widths)
+            ]
+        self.blank_logo = " " * self.logo_width
+
+        if theme is not None:
+            self.label_on, self.label_off = theme.wrap("label")
+            self.value_on, self.value_off = theme.wrap("value")
+            self.separator = " {}:{} ".format(*theme.wrap("separator"))
+        else:
+            self.label_on = self.label_off = self.value_on = self.value_off = ""
+            self.separator = " : "
+
+    def value_width(self, label_width: int) -> int:
+        """Get the room left for values next to labels of label_width"""
+        if self.width is None:
+            return self.truncate_length
+        available = self.width - self.logo_width - label_width - len(" : ")
+        return max(MIN_VALUE_WIDTH, available)
+
+    def lines(self, info: Mapping[str, Any]) -> List[str]:
+        """
+        Lay out a frame
+
+        Args:
+            info: Field label to display value, in display order
+
+        Returns:
+            Output lines without trailing newlines
+        """
+        label_width = max((len(label) for label in info), default=0)
+        value_width = self.value_width(label_width)
+
+        fields = [
+            f"{self.label_on}{label:<{label_width}}{self.label_off}{self.separator}"
+            f"{self.value_on}{truncate(str(value), value_width)}{self.value_off}"
+            for label, value in info.items()
+        ]
+        if not self.logo_width:
+            return fields
+
+        lines = []
+        for i in range(max(len(self.logo_lines), len(fields))):
+            if i >= len(fields):
+                lines.append(self.logo_lines[i])
+            elif i < len(self.padded_logo):
+                lines.append(self.padded_logo[i] + fields[i])
+            else:
+                lines.append(self.blank_logo + fields[i])
+        return lines
+
+    def render(self, info: Mapping[str, Any]) -> str:
+        """Lay out a frame as one string, ready for a single write"""
+        lines = self.lines(info)
+        return "\n".join(lines) + "\n" if lines else ""
@@ -0,0 +1,113 @@
+"""
+Background refresh of expired cache entries (stale-while-revalidate)
+"""
+import os
+import sys
+from typing import List, Optional
+
+
+LOCK_NAME = "revalidate.lock"
+
+# Hidden command-line flag the detached refresher is started with
+FLAG = "--revalidate"
+
+
+def _lock_path() -> str:
+    from .cache import get_cache
+    return os.path.join(str(get_cache().cache_dir), LOCK_NAME)
+
+
+def _try_lock(path: str) -> Optional[int]:
+    """
+    Take the refresher lock without blocking
+
+    Returns:
+        Open file descriptor holding the lock, or None if another
+        refresher holds it or locking is unsupported
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return None
+    try:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    except OSError:
+        return None
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def supported() -> bool:
+    """Whether background refreshes can be locked on this platform"""
+    try:
+        import fcntl  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def spawn(labels: List[str], config_path: Optional[str] = None) -> bool:
+    """
+    Start a detached process that recollects the given fields
+
+    Nothing is started while another refresher holds the lock.
+
+    Args:
+        labels: Field labels whose cached values expired
+        config_path: Config file of this run, passed on to the refresher
+
+    Returns:
+        Whether a refresher was started
+    """
+    fd = _try_lock(_lock_path())
+    if fd is None:
+        return False
+    # Only a probe: the refresher takes the lock itself
+    os.close(fd)
+
+    import subprocess
+
+    cmd = [sys.executable, "-m", "ezfetch", FLAG, ",".join(labels)]
+    if config_path:
+        cmd += ["--config", config_path]
+    try:
+        subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            start_new_session=True,
+        )
+    except OSError:
+        return False
+    return True
+
+
+def run(config, labels: List[str]) -> int:
+    """
+    Recollect fields and write them to the cache (the refresher process)
+
+    Returns:
+        Exit status: 0 on success, 1 if another refresher is running
+    """
+    fd = _try_lock(_lock_path())
+    if fd is None:
+        return 1
+    try:
+        from .cache import get_cache, set_cache_mode
+        from .collector import Snapshot
+
+        set_cache_mode(enabled=True, refresh=True)
+        # Nobody waits on the refresher, and a deadline would leave slow
+        # fields stale and respawn it on every run
+        config.set("performance", "deadline_ms", value=0)
+        Snapshot.from_config(config, labels).resolve()
+        get_cache().flush()
+    finally:
+        os.close(fd)
+    return 0
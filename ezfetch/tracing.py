@@ -0,0 +1,175 @@
+"""
+Timing spans for collectors and render stages
+"""
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .utils import thread_exec_log
+
+
+class Span:
+    """One timed stage: a collector run, a cache lookup or a render step"""
+
+    __slots__ = ("name", "category", "cache", "start", "wall", "cpu", "thread", "commands")
+
+    def __init__(self, name: str, category: str, cache: Optional[str] = None):
+        self.name = name
+        self.category = category
+        self.cache = cache
+        self.start = 0.0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.thread = 0
+        self.commands: List[Tuple[str, float]] = []
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Span as JSON-compatible dict, times in milliseconds"""
+        return {
+            "name": self.name,
+            "category": self.category,
+            "wall_ms": round(self.wall * 1000, 3),
+            "cpu_ms": round(self.cpu * 1000, 3),
+            "cache": self.cache,
+            "spawned": [
+                {"command": command, "ms": round(seconds * 1000, 3)}
+                for command, seconds in self.commands
+            ],
+        }
+
+
+class _Timer:
+    """Context manager timing a span on the current thread"""
+
+    __slots__ = ("profiler", "span", "_wall", "_cpu", "_log", "_log_start")
+
+    def __init__(self, profiler: "Profiler", span: Span):
+        self.profiler = profiler
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self._log = thread_exec_log()
+        self._log_start = len(self._log)
+        self._cpu = time.thread_time()
+        self._wall = time.perf_counter()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        span = self.span
+        span.wall = time.perf_counter() - self._wall
+        span.cpu = time.thread_time() - self._cpu
+        span.start = self._wall - self.profiler.origin
+        span.thread = threading.get_ident()
+        span.commands = list(self._log[self._log_start:])
+        self.profiler.add(span)
+
+
+class Profiler:
+    """Collects spans from every thread of one run"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def span(self, name: str, category: str = "collector", cache: Optional[str] = None) -> _Timer:
+        """
+        Time a block of code
+
+        Example:
+            with profiler.span("logo", "render"):
+                logo = get_logo()
+        """
+        return _Timer(self, Span(name, category, cache))
+
+    def wrap(
+        self, name: str, func: Callable[..., Any], category: str = "collector",
+        cache: Optional[str] = None,
+    ) -> Callable[..., Any]:
+        """Wrap a callable so every call is timed"""
+        def timed(*args, **kwargs):
+            with self.span(name, category, cache):
+                return func(*args, **kwargs)
+        return timed
+
+    def sorted_spans(self) -> List[Span]:
+        """Spans ordered by wall time, slowest first"""
+        with self._lock:
+            return sorted(self.spans, key=lambda span: -span.wall)
+
+    def meta(self) -> List[Dict[str, Any]]:
+        """Spans as JSON-compatible dicts for the JSON output's _meta block"""
+        return [span.as_dict() for span in self.sorted_spans()]
+
+    def format_table(self) -> str:
+        """Format spans as a table sorted by wall time"""
+        spans = self.sorted_spans()
+        width = max([len("Span")] + [len(span.name) for span in spans])
+        lines = [
+            f"{'Span':<{width}}  {'stage':<9}  {'wall ms':>8}  {'cpu ms':>8}  "
+            f"{'cache':<5}  spawned"
+        ]
+        for span in spans:
+            commands = ", ".join(
+                f"{command} ({seconds * 1000:.1f} ms)" for command, seconds in span.commands
+            )
+            lines.append(
+                f"{span.name:<{width}}  {span.category:<9}  {span.wall * 1000:8.2f}  "
+                f"{span.cpu * 1000:8.2f}  {span.cache or '-':<5}  {commands or '-'}"
+            )
+        return "\n".join(lines)
+
+    def trace_events(self) -> Dict[str, Any]:
+        """
+        Export spans in Chrome trace-event format
+
+        The result loads in chrome://tracing and Perfetto; every span is a
+        complete ("X") event on the thread that ran it.
+        """
+        pid = os.getpid()
+        events = []
+        for span in self.sorted_spans():
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round(span.start * 1e6, 1),
+                "dur": round(span.wall * 1e6, 1),
+                "pid": pid,
+                "tid": span.thread,
+                "args": {
+                    "cpu_ms": round(span.cpu * 1000, 3),
+                    "cache": span.cache,
+                    "spawned": [command for command, _ in span.commands],
+                },
+            })
+        events.sort(key=lambda event: event["ts"])
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path: str) -> None:
+        """Write Chrome trace-event JSON to path"""
+        import json
+
+        with open(path, "w") as f:
+            json.dump(self.trace_events(), f)
+
+
+_profiler: Optional[Profiler] = None
+
+
+def enable() -> Profiler:
+    """Start profiling this run and return the profiler"""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
+
+
+def active() -> Optional[Profiler]:
+    """Get the profiler of this run, or None when profiling is off"""
+    return _profiler
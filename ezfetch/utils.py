@@ -2,34 +2,215 @@
 Utility functions for ezfetch
 """
 import os
-import subprocess
-import shutil
-from typing import Optional, List, Tuple
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, List, Sequence, Tuple, Union
 
 
-def run_command(cmd: str, shell: bool = True, timeout: int = 5) -> Optional[str]:
+def run_command(
+    cmd: Union[str, Sequence[str]],
+    shell: Optional[bool] = None,
+    timeout: float = 5,
+) -> Optional[str]:
     """
-    Run a shell command and return output or None on failure
+    Run a command and return output or None on failure
+    
+    Argument lists are executed directly without a shell; do any
+    filtering of the output in Python rather than through pipes.
     
     Args:
-        cmd: Command to run
-        shell: Whether to use shell
+        cmd: Command to run, as an argv list or a shell string
+        shell: Whether to use shell (default: only for string commands)
         timeout: Command timeout in seconds
     
     Returns:
         Command output as string or None on failure
     """
+    if shell is None:
+        shell = isinstance(cmd, str)
+    
+    cancelled = getattr(_exec_local, "cancelled", None)
+    if cancelled is not None and cancelled():
+        return None
+    
+    runner = getattr(_exec_local, "runner", None)
+    if runner is not None:
+        start = time.perf_counter()
+        try:
+            return runner(cmd, shell, timeout)
+        finally:
+            _record_exec(time.perf_counter() - start, cmd)
+    
+    import subprocess
+    
+    start = time.perf_counter()
     try:
-        result = subprocess.check_output(
+        # Each command gets its own process group, so it can be killed
+        # together with anything it spawned
+        proc = subprocess.Popen(
             cmd,
             shell=shell,
             text=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
             stderr=subprocess.DEVNULL,
-            timeout=timeout
+            start_new_session=os.name == "posix",
         )
-        return result.strip()
-    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+    except (OSError, ValueError):
+        # Nothing was started (e.g. the binary is missing)
+        with _exec_lock:
+            _exec_stats["failed"] += 1
         return None
+    
+    with _exec_lock:
+        _running[proc] = cancelled
+    if cancelled is not None and cancelled():
+        # Abandoned while starting; kill_running() may have missed it
+        _kill_group(proc)
+    try:
+        output, _ = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        _kill_group(proc)
+        proc.communicate()
+        return None
+    finally:
+        with _exec_lock:
+            _running.pop(proc, None)
+        _record_exec(time.perf_counter() - start, cmd)
+    if proc.returncode != 0:
+        return None
+    return output.strip()
+
+
+def run(*argv: str, timeout: float = 5) -> Optional[str]:
+    """
+    Run a program without a shell and return its output or None on failure
+    
+    Example:
+        run("xrandr", "--current")
+    """
+    return run_command(list(argv), shell=False, timeout=timeout)
+
+
+def run_lines(*argv: str, timeout: float = 5) -> List[str]:
+    """Run a program without a shell and return its output lines"""
+    output = run_command(list(argv), shell=False, timeout=timeout)
+    return output.splitlines() if output else []
+
+
+# Per-run counters for processes spawned through run_command
+_exec_lock = threading.Lock()
+_exec_stats = {"spawned": 0, "failed": 0, "seconds": 0.0}
+
+# Processes started by run_command that have not exited yet, with the
+# cancellation check of the thread that started them
+_running: Dict[Any, Optional[Callable[[], bool]]] = {}
+
+
+def _kill_group(proc) -> None:
+    """Kill a process and every process in its group"""
+    try:
+        if os.name == "posix":
+            import signal
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except OSError:
+        pass
+
+
+def kill_running(cancelled_only: bool = False) -> int:
+    """
+    Kill commands still running through run_command
+    
+    Used when collection is abandoned at a deadline or a collector times
+    out; the collectors waiting on these commands then see a failure.
+    
+    Args:
+        cancelled_only: Only kill commands started by threads whose
+            set_exec_cancelled() check is now true
+    
+    Returns:
+        Number of process groups killed
+    """
+    with _exec_lock:
+        procs = [
+            proc for proc, cancelled in _running.items()
+            if not cancelled_only or (cancelled is not None and cancelled())
+        ]
+    for proc in procs:
+        _kill_group(proc)
+    return len(procs)
+
+
+# Per-thread log of spawned commands, only kept once a thread asks for it
+_exec_local = threading.local()
+
+
+def _record_exec(seconds: float, cmd: Union[str, Sequence[str]] = "") -> None:
+    """Account for one spawned process"""
+    with _exec_lock:
+        _exec_stats["spawned"] += 1
+        _exec_stats["seconds"] += seconds
+    log = getattr(_exec_local, "log", None)
+    if log is not None:
+        log.append((cmd if isinstance(cmd, str) else " ".join(cmd), seconds))
+
+
+def set_exec_runner(
+    runner: Optional[Callable[[Union[str, Sequence[str]], bool, float], Optional[str]]]
+) -> None:
+    """
+    Route run_command calls made by the current thread through runner
+    
+    The runner receives (cmd, shell, timeout) and returns the stripped
+    output or None, like run_command. Pass None to restore the default.
+    """
+    _exec_local.runner = runner
+
+
+def set_exec_cancelled(check: Optional[Callable[[], bool]]) -> None:
+    """
+    Make run_command on the current thread fail once check() is true
+    
+    Lets an abandoned collector finish without starting new commands.
+    Pass None to remove the check.
+    """
+    _exec_local.cancelled = check
+
+
+def thread_exec_log() -> List[Tuple[str, float]]:
+    """
+    Get the processes spawned by the current thread
+    
+    Logging starts with the first call on a thread; the returned list
+    grows with a (command, seconds) entry per process spawned afterwards.
+    """
+    log = getattr(_exec_local, "log", None)
+    if log is None:
+        log = _exec_local.log = []
+    return log
+
+
+def exec_stats() -> Dict[str, float]:
+    """
+    Get process spawn counters for this run
+    
+    Returns:
+        Dict with "spawned" (number of processes started), "failed"
+        (commands that could not be started) and "seconds" (total wall
+        time spent waiting for started processes)
+    """
+    with _exec_lock:
+        return dict(_exec_stats)
+
+
+def reset_exec_stats() -> None:
+    """Reset process spawn counters"""
+    with _exec_lock:
+        _exec_stats["spawned"] = 0
+        _exec_stats["failed"] = 0
+        _exec_stats["seconds"] = 0.0
 
 
 def read_file(filepath: str) -> Optional[str]:
@@ -72,6 +253,7 @@ def read_file_line(filepath: str, search_prefix: str) -> Optional[str]:
 
 def which(command: str) -> bool:
     """Check if a command is available"""
+    import shutil
     return shutil.which(command) is not None
 
 
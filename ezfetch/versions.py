@@ -0,0 +1,66 @@
+"""
+Version probes memoized against the program binary
+"""
+import os
+from typing import Callable, Optional
+
+from .cache import CachePolicy
+from .utils import run
+
+
+def resolve_program(program: str) -> Optional[str]:
+    """
+    Resolve a program name or path to the path of its executable
+
+    Returns:
+        Absolute path or None if not found
+    """
+    import shutil
+
+    path = program if os.path.isabs(program) else shutil.which(program)
+    if not path or not os.access(path, os.X_OK):
+        return None
+    return path
+
+
+def program_version(
+    program: str,
+    *args: str,
+    parse: Optional[Callable[[str], Optional[str]]] = None,
+) -> Optional[str]:
+    """
+    Get a program's version, spawning it only when its binary changed
+
+    The parsed result is cached against the inode, mtime and size of the
+    binary (symlinks followed), so it is only recomputed after the program
+    is upgraded or replaced.
+
+    Args:
+        program: Program name or path
+        args: Arguments that make the program print its version
+        parse: Function extracting the version from the output
+            (default: the whole output)
+
+    Returns:
+        Version string or None if the program is missing or failed
+    """
+    path = resolve_program(program)
+    if path is None:
+        return None
+
+    policy = CachePolicy(CachePolicy.VALIDATOR, sources=[path])
+    key = "version_" + " ".join((path,) + args)
+    version = policy.load(key)
+    if version is not None:
+        return version
+
+    output = run(path, *args)
+    if not output:
+        return None
+    try:
+        version = parse(output) if parse else output
+    except (IndexError, ValueError):
+        version = None
+    if version:
+        policy.store(key, version)
+    return version
@@ -0,0 +1,161 @@
+"""
+Live view that redraws only the fields that changed
+"""
+import sys
+import time
+from typing import Any, Callable, Dict, List, Mapping
+
+# Terminal control sequences
+ALT_SCREEN_ON = "\033[?1049h"
+ALT_SCREEN_OFF = "\033[?1049l"
+CURSOR_HIDE = "\033[?25l"
+CURSOR_SHOW = "\033[?25h"
+CLEAR_SCREEN = "\033[2J"
+CLEAR_LINE = "\033[K"
+
+# Longest sleep between ticks, so a resize is picked up promptly
+MAX_TICK = 1.0
+
+
+def _move(row: int) -> str:
+    """Cursor-address the start of a 1-based row"""
+    return f"\033[{row};1H"
+
+
+def diff_lines(previous: List[str], current: List[str]) -> str:
+    """
+    Build the output that turns previous lines into current lines
+
+    Only rows whose content changed are rewritten; rows left over from a
+    longer previous frame are cleared.
+
+    Returns:
+        Escape sequences and text to write to the terminal
+    """
+    out = []
+    for row, line in enumerate(current):
+        if row >= len(previous) or previous[row] != line:
+            out.append(_move(row + 1) + line + CLEAR_LINE)
+    for row in range(len(current), len(previous)):
+        out.append(_move(row + 1) + CLEAR_LINE)
+    return "".join(out)
+
+
+def run_watch(
+    snapshot,
+    render: Callable[[Mapping[str, Any]], List[str]],
+    intervals: Dict[str, float],
+    stream=None,
+) -> None:
+    """
+    Keep the output on screen and refresh volatile fields in place
+
+    Static fields are collected once. Each tick only the fields whose
+    refresh interval elapsed are recollected, and only the output lines
+    that differ from the previous frame are redrawn.
+
+    Args:
+        snapshot: collector.Snapshot holding the displayed fields
+        render: Builds output lines from field values
+        intervals: Refresh interval in seconds per volatile field label
+        stream: Output stream (default: sys.stdout)
+    """
+    stream = stream or sys.stdout
+    resized = [False]
+
+    def _terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    try:
+        import signal
+        previous_handler = signal.signal(
+            signal.SIGWINCH, lambda signum, frame: resized.__setitem__(0, True)
+        )
+        # Let SIGTERM restore the terminal like Ctrl-C does
+        previous_term = signal.signal(signal.SIGTERM, _terminate)
+    except (ImportError, AttributeError, ValueError):
+        signal = None
+
+    stream.write(ALT_SCREEN_ON + CURSOR_HIDE + CLEAR_SCREEN)
+    stream.flush()
+    previous: List[str] = []
+    try:
+        while True:
+            due = snapshot.due(intervals)
+            if due:
+                snapshot.refresh(due)
+            current = render(dict(snapshot.items()))
+            if resized[0]:
+                resized[0] = False
+                previous = []
+                stream.write(CLEAR_SCREEN)
+            output = diff_lines(previous, current)
+            if output:
+                stream.write(output)
+                stream.flush()
+            previous = current
+            time.sleep(min(snapshot.next_due(intervals), MAX_TICK))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if signal is not None:
+            signal.signal(signal.SIGWINCH, previous_handler)
+            signal.signal(signal.SIGTERM, previous_term)
+        stream.write(CURSOR_SHOW + ALT_SCREEN_OFF)
+        stream.flush()
+
+
+def run_stream(
+    snapshot,
+    intervals: Dict[str, float],
+    changes_only: bool = False,
+    stream=None,
+) -> None:
+    """
+    Write snapshots as NDJSON for as long as the process runs
+
+    Every line is one compact JSON object with a "monotonic" timestamp
+    (time.monotonic() of the refresh). Static fields are collected once and
+    repeated from memory; only volatile fields are recollected.
+
+    Args:
+        snapshot: collector.Snapshot holding the streamed fields
+        intervals: Refresh interval in seconds per volatile field label
+        changes_only: After the first full line, write only the fields that
+            changed, as {"monotonic": ..., "changes": {...}}
+        stream: Output stream (default: sys.stdout)
+    """
+    import json
+
+    stream = stream or sys.stdout
+    previous: Dict[str, Any] = {}
+    try:
+        while True:
+            due = snapshot.due(intervals)
+            if due:
+                snapshot.refresh(due)
+            values = dict(snapshot.items())
+            now = round(time.monotonic(), 3)
+            record = None
+            if not previous or (due and not changes_only):
+                record = {"monotonic": now, "values": values}
+            elif due:
+                changes = {
+                    label: value for label, value in values.items()
+                    if previous.get(label) != value
+                }
+                if changes:
+                    record = {"monotonic": now, "changes": changes}
+            if record is not None:
+                stream.write(json.dumps(record, separators=(",", ":")) + "\n")
+                stream.flush()
+            previous = values
+            # next_due is infinite when no streamed field is volatile
+            time.sleep(min(snapshot.next_due(intervals), MAX_TICK))
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        # The reader went away; keep the interpreter from failing to flush
+        import os
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, stream.fileno())
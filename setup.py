@@ -7,6 +7,7 @@
     author="yokaimsi",
     author_email="contact.now.itachi@gmail.com",
     packages=find_packages(),
+    package_data={"ezfetch": ["logos.txt"]},
     install_requires=["psutil"],
     entry_points={
         "console_scripts": [
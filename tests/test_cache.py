@@ -0,0 +1,29 @@
+"""
+Tests for the cache store
+"""
+from pathlib import Path
+
+from ezfetch import cache
+from ezfetch.cache import Cache, CachePolicy
+from ezfetch.collector import Snapshot, cache_policies
+
+
+# Under procfs, so it cannot be created even by root
+UNWRITABLE = Path("/proc/nonexistent/ezfetch")
+
+
+def test_unwritable_cache_dir_disables_cache():
+    store = Cache(cache_dir=UNWRITABLE)
+    assert not store.enabled
+    store.set("key", "value")
+    assert store.get("key") is None
+    store.flush()
+
+
+def test_collection_works_without_cache_dir(monkeypatch):
+    monkeypatch.setattr(cache, "_cache_instance", Cache(cache_dir=UNWRITABLE))
+    snapshot = Snapshot(["OS", "Kernel"], policies=cache_policies())
+    values = snapshot.resolve()
+    assert set(values) == {"OS", "Kernel"}
+    assert all(isinstance(value, str) and value for value in values.values())
+    assert CachePolicy(CachePolicy.BOOT).load("field_kernel") is None
@@ -0,0 +1,57 @@
+"""
+Tests for the daemon client path
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs the CLI against the daemon and reports which modules it loaded
+CLIENT = """
+import json, runpy, sys
+sys.argv = ["ezfetch", "--json"]
+try:
+    runpy.run_module("ezfetch", run_name="__main__")
+except SystemExit:
+    pass
+loaded = [name for name in ("ezfetch.info", "subprocess") if name in sys.modules]
+print(json.dumps(loaded), file=sys.stderr)
+"""
+
+
+@pytest.fixture
+def daemon_env(tmp_path):
+    if not hasattr(os, "getuid"):
+        pytest.skip("needs Unix sockets")
+    env = dict(os.environ, HOME=str(tmp_path), XDG_RUNTIME_DIR=str(tmp_path))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "ezfetch", "--daemon"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    socket_path = tmp_path / "ezfetch.sock"
+    deadline = time.monotonic() + 10
+    while not socket_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    try:
+        yield env
+    finally:
+        proc.terminate()
+        proc.wait(timeout=5)
+
+
+def test_client_imports_no_collectors(daemon_env):
+    env = dict(daemon_env, SHELL="/bin/zsh")
+    proc = subprocess.run(
+        [sys.executable, "-c", CLIENT], cwd=ROOT, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+        universal_newlines=True,
+    )
+    assert json.loads(proc.stderr) == []
+    values = json.loads(proc.stdout)
+    # Caller-dependent fields come from the client's environment
+    assert values["Shell"] == "zsh"